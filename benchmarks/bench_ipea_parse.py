@@ -0,0 +1,75 @@
+"""Micro-benchmark do parser dos CSVs do IPEA.
+
+Compara a leitura original das páginas (``dayfirst`` + ``str.replace``) com
+``petroleo.data.parse_ipea_csv`` nos dois CSVs do repositório e num arquivo
+sintético no mesmo formato.
+
+    python benchmarks/bench_ipea_parse.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from petroleo import data  # noqa: E402
+
+
+def legacy_parse(path, coluna, nome):
+    df = pd.read_csv(path, encoding="windows-1252", sep=";")
+    df = df.dropna()
+    df['DATA'] = pd.to_datetime(df['DATA'], dayfirst=True)
+    df[nome] = df[coluna].str.replace(",", ".").astype("float")
+    return df[['DATA', nome]].sort_values('DATA').reset_index(drop=True)
+
+
+def write_synthetic_csv(path, rows, coluna, seed=0):
+    rng = np.random.default_rng(seed)
+    datas = pd.Timestamp('2024-11-25') - pd.to_timedelta(np.arange(rows) % 40000, unit='D')
+    valores = np.round(np.abs(rng.normal(70, 20, rows)), 2)
+    df = pd.DataFrame({
+        'DATA': datas.strftime('%d/%m/%Y'),
+        coluna: pd.Series(valores).map('{:.2f}'.format).str.replace('.', ',', regex=False),
+    })
+    df.to_csv(path, sep=';', index=False, encoding='windows-1252')
+
+
+def best_of(fn, repeat):
+    tempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        resultado = fn()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def bench(nome_caso, path, coluna, nome, repeat):
+    t_legacy, df_legacy = best_of(lambda: legacy_parse(path, coluna, nome), repeat)
+    t_novo, df_novo = best_of(lambda: data.parse_ipea_csv(path, coluna, nome), repeat)
+    pd.testing.assert_frame_equal(df_legacy, df_novo, check_dtype=False)
+    print(f"{nome_caso:<28} {len(df_novo):>10} linhas  legado {t_legacy:8.3f}s  novo {t_novo:8.3f}s  {t_legacy / t_novo:6.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000, help='linhas do CSV sintético (0 para pular)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    bench('tabela_dxgvTable.csv', data.PETROLEO_CSV, data.PETROLEO_COLUNA, 'Preço', args.repeat)
+    bench('tabela_dxgvTable_dolar.csv', data.DOLAR_CSV, data.DOLAR_COLUNA, 'Cotacao_Dolar', args.repeat)
+
+    if args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sintetico.csv')
+            write_synthetic_csv(path, args.rows, data.PETROLEO_COLUNA)
+            bench(f'sintético ({args.rows} linhas)', path, data.PETROLEO_COLUNA, 'Preço', 1)
+
+
+if __name__ == '__main__':
+    main()
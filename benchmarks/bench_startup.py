@@ -0,0 +1,88 @@
+"""Orçamento de tempo de importação das páginas do Streamlit.
+
+Para cada página, executa as importações de nível de módulo em um processo
+novo com ``python -X importtime`` e soma o tempo próprio de cada módulo.
+Compara com ``startup_budget.json`` e termina com código 1 se alguma página
+passar do orçamento (mais a tolerância).
+
+    python benchmarks/bench_startup.py            # verifica
+    python benchmarks/bench_startup.py --update   # regrava o orçamento
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+BUDGET_PATH = Path(__file__).resolve().parent / "startup_budget.json"
+PAGINAS = [
+    'Preço_do_Petróleo_Brent.py',
+    'pages/1_Análise_Exploratória_de_Dados.py',
+    'pages/2_Modelagem_e_Previsão.py',
+    'pages/3_Insights.py',
+]
+
+
+def page_imports(path):
+    """Código com apenas os ``import`` de nível de módulo da página."""
+    arvore = ast.parse(Path(path).read_text(encoding='utf-8'))
+    return "\n".join(ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom)))
+
+
+def measure(codigo):
+    """Retorna ``(total_ms, [(modulo, cumulativo_ms), ...])`` de uma execução."""
+    env = {**os.environ, 'PYTHONPATH': str(RAIZ)}
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        cwd=RAIZ, env=env, capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    topo = []
+    for linha in resultado.stderr.splitlines():
+        if not linha.startswith('import time:') or 'self [us]' in linha:
+            continue
+        proprio, cumulativo, nome = linha[len('import time:'):].split('|')
+        total_us += int(proprio)
+        if not nome[1:].startswith(' '):
+            topo.append((nome.strip(), int(cumulativo) / 1000))
+    return total_us / 1000, sorted(topo, key=lambda item: -item[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='execuções por página (vale a menor)')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='folga relativa sobre o orçamento')
+    parser.add_argument('--update', action='store_true', help='grava as medições atuais como orçamento')
+    args = parser.parse_args()
+
+    orcamento = json.loads(BUDGET_PATH.read_text()) if BUDGET_PATH.exists() else {}
+    medicoes = {}
+    estourou = False
+    for pagina in PAGINAS:
+        codigo = page_imports(RAIZ / pagina)
+        execucoes = [measure(codigo) for _ in range(args.repeat)]
+        total_ms, topo = min(execucoes, key=lambda execucao: execucao[0])
+        medicoes[pagina] = round(total_ms, 1)
+
+        limite = orcamento.get(pagina)
+        status = ''
+        if limite is not None and not args.update:
+            if total_ms > limite * (1 + args.tolerance):
+                status = f'  ESTOUROU (orçamento {limite:.0f} ms)'
+                estourou = True
+            else:
+                status = f'  ok (orçamento {limite:.0f} ms)'
+        mais_pesados = ', '.join(f'{nome} {ms:.0f}ms' for nome, ms in topo[:4])
+        print(f'{pagina:<45} {total_ms:8.1f} ms{status}\n    {mais_pesados}')
+
+    if args.update:
+        BUDGET_PATH.write_text(json.dumps(medicoes, indent=2, ensure_ascii=False) + "\n")
+        print(f'Orçamento gravado em {BUDGET_PATH}')
+    sys.exit(1 if estourou else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""Teste de carga da API (``petroleo.api``) com clientes concorrentes.
+
+Cada cliente mantém uma conexão HTTP/1.1 aberta (keep-alive) e faz as
+requisições em sequência, alternando entre as rotas de ``--paths``. Ao final
+são mostradas, por rota e no total, a latência p50/p90/p99/máxima, os status
+e a vazão. Com ``--conditional`` cada cliente reenvia o ``ETag`` recebido em
+``If-None-Match`` (o caso de um consumidor que faz polling) e as respostas
+passam a ser 304.
+
+    python -m petroleo.api --port 8000 &
+    python benchmarks/load_test.py --url http://127.0.0.1:8000 --clients 50 --requests 5000
+    python benchmarks/load_test.py --serve --clients 50 --requests 5000 --conditional
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PATHS = '/forecast?horizon=90,/outliers,/correlation,/series/brent_brl'
+
+
+async def _request(reader, writer, host, path, etag=None):
+    linhas = [f"GET {path} HTTP/1.1", f"Host: {host}"]
+    if etag:
+        linhas.append(f"If-None-Match: {etag}")
+    writer.write(("\r\n".join(linhas) + "\r\n\r\n").encode('latin-1'))
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        linha = await reader.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            break
+        nome, _, valor = linha.decode('latin-1').partition(':')
+        headers[nome.strip().lower()] = valor.strip()
+    tamanho = int(headers.get('content-length', 0))
+    if tamanho:
+        await reader.readexactly(tamanho)
+    return status, headers.get('etag')
+
+
+async def _client(url, paths, n, conditional, latencias, status):
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    etags = {}
+    try:
+        for i in range(n):
+            path = paths[i % len(paths)]
+            inicio = time.perf_counter()
+            codigo, etag = await _request(reader, writer, url.netloc, path, etags.get(path) if conditional else None)
+            latencias[path].append(time.perf_counter() - inicio)
+            status[path][codigo] += 1
+            if etag:
+                etags[path] = etag
+    finally:
+        writer.close()
+
+
+async def load_test(base_url, paths, clients, requests, conditional=False):
+    """Dispara ``requests`` requisições repartidas entre ``clients`` conexões."""
+    url = urlparse(base_url)
+    latencias = defaultdict(list)
+    status = defaultdict(Counter)
+    por_cliente = [requests // clients + (i < requests % clients) for i in range(clients)]
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _client(url, paths, n, conditional, latencias, status) for n in por_cliente if n
+    ))
+    return latencias, status, time.perf_counter() - inicio
+
+
+def _linha(nome, valores, status):
+    ms = np.asarray(valores) * 1000
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    codigos = ' '.join(f"{codigo}:{n}" for codigo, n in sorted(status.items()))
+    return f"{nome:<28} {len(ms):>7} {p50:>8.2f} {p90:>8.2f} {p99:>8.2f} {ms.max():>8.2f}  {codigos}"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _serve():
+    """Sobe ``python -m petroleo.api`` em uma porta livre e espera o ``/health``."""
+    port = _free_port()
+    processo = subprocess.Popen(
+        [sys.executable, '-m', 'petroleo.api', '--port', str(port)],
+        cwd=ROOT, env={**os.environ, 'PYTHONPATH': str(ROOT)},
+    )
+    limite = time.monotonic() + 60
+    while time.monotonic() < limite:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1) as s:
+                s.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+                if s.recv(64).startswith(b"HTTP/1.1 200"):
+                    return processo, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError("A API não respondeu em 60s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga da API (latência p50/p99)")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--serve', action='store_true', help='sobe a API em uma porta livre (ignora --url)')
+    parser.add_argument('--paths', default=DEFAULT_PATHS, help='rotas separadas por vírgula')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=5000, help='total de requisições')
+    parser.add_argument('--warmup', type=int, default=1, help='requisições de aquecimento por rota')
+    parser.add_argument('--conditional', action='store_true', help='reenvia o ETag em If-None-Match')
+    args = parser.parse_args()
+
+    processo = None
+    url = args.url
+    if args.serve:
+        processo, url = _serve()
+    try:
+        paths = [path.strip() for path in args.paths.split(',') if path.strip()]
+        # O aquecimento monta (e, se preciso, ajusta) cada resposta antes da medição.
+        asyncio.run(load_test(url, paths, 1, args.warmup * len(paths)))
+        latencias, status, segundos = asyncio.run(
+            load_test(url, paths, args.clients, args.requests, args.conditional)
+        )
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+    print(f"{args.requests} requisições, {args.clients} clientes, {url}{' (condicionais)' if args.conditional else ''}")
+    print(f"{'rota':<28} {'n':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}  status")
+    for path in paths:
+        print(_linha(path, latencias[path], status[path]))
+    todas = [valor for path in paths for valor in latencias[path]]
+    total = sum((status[path] for path in paths), Counter())
+    print(_linha('total', todas, total))
+    print(f"vazão: {len(todas) / segundos:.0f} req/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+"""Benchmarks das etapas de cálculo de cada página, sem o Streamlit.
+
+Cada etapa (leitura, alinhamento, estatísticas, ajuste, previsão e montagem
+das figuras) roda sobre os CSVs do repositório (escala 1) e sobre versões
+sintéticas com 10x, 100x ou 1000x mais linhas. Para cada etapa e escala são
+registrados o melhor tempo de parede entre ``--repeat`` execuções e o pico
+de memória alocada (``tracemalloc``) em uma execução à parte.
+
+    python benchmarks/run.py --scales 1,10
+    python benchmarks/run.py --scales 1,10 --save-baseline
+    python benchmarks/run.py --scales 1,10,100,1000 --stages principal,analise
+
+A comparação com ``baseline.json`` marca as etapas que ficaram mais lentas
+ou usam mais memória do que a tolerância permite e termina com código 1.
+"""
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from petroleo import align, charts, data, downsample, forecast, forecasters, outliers, range_query, stats  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+PROPHET_PARAMS = {'daily_seasonality': True}
+
+
+def scaled(df, coluna, escala, seed=0):
+    """Mesma série e mesmo período com ``escala`` vezes mais pontos (interpolados + ruído)."""
+    if escala == 1:
+        return df
+    rng = np.random.default_rng(seed)
+    inicio, fim = df['DATA'].iloc[0], df['DATA'].iloc[-1]
+    datas = pd.date_range(inicio, fim, periods=len(df) * escala)
+    x_original = df['DATA'].to_numpy().astype('datetime64[ns]').astype(np.int64)
+    x_novo = datas.to_numpy().astype('datetime64[ns]').astype(np.int64)
+    valores = np.interp(x_novo, x_original, df[coluna].to_numpy())
+    valores = valores * (1 + rng.normal(0, 0.002, len(valores)))
+    return pd.DataFrame({'DATA': datas.astype(df['DATA'].dtype), coluna: valores})
+
+
+class Contexto:
+    """Dados de entrada de uma escala, criados sob demanda e reaproveitados entre etapas."""
+
+    def __init__(self, escala, tmp_dir):
+        self.escala = escala
+        self.tmp_dir = Path(tmp_dir)
+        self._cache = {}
+
+    def _get(self, nome, criar):
+        if nome not in self._cache:
+            self._cache[nome] = criar()
+        return self._cache[nome]
+
+    @property
+    def petroleo(self):
+        return self._get('petroleo', lambda: scaled(data.load_petroleo(), 'Preço', self.escala))
+
+    @property
+    def dolar(self):
+        return self._get('dolar', lambda: scaled(data.load_dolar(), 'Cotacao_Dolar', self.escala, seed=1))
+
+    @property
+    def csv_petroleo(self):
+        def criar():
+            from bench_ipea_parse import write_synthetic_csv
+
+            if self.escala == 1:
+                return data.PETROLEO_CSV
+            path = self.tmp_dir / f"petroleo-{self.escala}.csv"
+            write_synthetic_csv(path, len(data.load_petroleo()) * self.escala, data.PETROLEO_COLUNA)
+            return path
+        return self._get('csv_petroleo', criar)
+
+    @property
+    def combinado(self):
+        return self._get('combinado', lambda: align.align(
+            self.petroleo.rename(columns={'Preço': 'Preço_Petróleo'}), self.dolar, tolerance='3D'
+        ))
+
+    @property
+    def prophet_frames(self):
+        def criar():
+            df = self.petroleo.rename(columns={'DATA': 'ds', 'Preço': 'y'})
+            df = df[(df['ds'] >= '2019-11-25') & (df['ds'] <= '2024-11-25')]
+            return df[df['ds'] <= '2023-11-25'], df[df['ds'] > '2023-11-25']
+        return self._get('prophet_frames', criar)
+
+    @property
+    def modelo(self):
+        def criar():
+            from prophet import Prophet
+
+            return Prophet(**PROPHET_PARAMS).fit(self.prophet_frames[0])
+        return self._get('modelo', criar)
+
+
+def _stage_load_csv(ctx):
+    path = ctx.csv_petroleo
+    return lambda: data.parse_ipea_csv(path, data.PETROLEO_COLUNA, 'Preço')
+
+
+def _stage_load_cache(ctx):
+    cache_dir = ctx.tmp_dir / f"cache-{ctx.escala}"
+    path = ctx.csv_petroleo
+    data.load_series(path, data.PETROLEO_COLUNA, 'Preço', cache_dir)
+    return lambda: data.load_series(path, data.PETROLEO_COLUNA, 'Preço', cache_dir)
+
+
+def _stage_range_index(ctx):
+    serie = ctx.petroleo.set_index('DATA')['Preço']
+    return lambda: range_query.SeriesRange(serie)
+
+
+def _stage_range_query(ctx):
+    serie = range_query.SeriesRange(ctx.petroleo.set_index('DATA')['Preço'])
+    inicio, fim = pd.Timestamp('2008-01-01'), pd.Timestamp('2016-01-01')
+    return lambda: (serie.window(inicio, fim), serie.max(inicio, fim), serie.min(inicio, fim))
+
+
+def _stage_downsample(ctx):
+    df = ctx.petroleo
+    return lambda: downsample.downsample(df, 'DATA', 'Preço')
+
+
+def _stage_render_principal(ctx):
+    df = downsample.downsample(ctx.petroleo, 'DATA', 'Preço')
+    return lambda: charts.price_chart(df).to_json()
+
+
+def _stage_align(ctx):
+    petroleo, dolar = ctx.petroleo.rename(columns={'Preço': 'Preço_Petróleo'}), ctx.dolar
+    return lambda: align.align(petroleo, dolar, tolerance='3D')
+
+
+def _stage_stats(ctx):
+    df = ctx.combinado
+    return lambda: stats.relationship_stats(df['Preço_Petróleo'], df['Cotacao_Dolar'])
+
+
+def _stage_rolling(ctx):
+    x, y = ctx.combinado['Preço_Petróleo'].to_numpy(), ctx.combinado['Cotacao_Dolar'].to_numpy()
+    return lambda: (stats.rolling_pearson(x, y, 252), stats.rolling_spearman(x, y, 252), stats.rolling_beta(x, y, 252))
+
+
+def _stage_outliers(ctx):
+    valores = ctx.petroleo['Preço'].to_numpy()
+    return lambda: outliers.rolling_zscore(valores, window=12, threshold=2)
+
+
+def _stage_render_analise(ctx):
+    df = ctx.combinado
+    estatisticas = {'intercept': 1.0, 'slope': 0.02}
+
+    def render():
+        charts.oil_vs_dollar_chart(
+            downsample.downsample(df, 'DATA', 'Preço_Petróleo'),
+            downsample.downsample(df, 'DATA', 'Cotacao_Dolar'),
+        ).to_json()
+        charts.regression_chart(df, estatisticas).to_json()
+    return render
+
+
+def _stage_fit(ctx):
+    from prophet import Prophet
+
+    df_train = ctx.prophet_frames[0]
+    return lambda: Prophet(**PROPHET_PARAMS).fit(df_train)
+
+
+def _stage_predict(ctx):
+    modelo, df_test = ctx.modelo, ctx.prophet_frames[1]
+    return lambda: modelo.predict(df_test)
+
+
+def _stage_forecast(ctx):
+    modelo = ctx.modelo
+    return lambda: forecast.forecast(modelo, [30, 90, 180])
+
+
+def _stage_forecast_point(ctx):
+    modelo = ctx.modelo
+    return lambda: forecast.forecast(modelo, [30, 90, 180], uncertainty_samples=0)
+
+
+def _stage_baselines(ctx):
+    df_train, df_test = ctx.prophet_frames
+    for nome in ('ets', 'arima'):
+        forecasters.FORECASTERS[nome].preload()
+
+    def baselines():
+        for nome in ('naive', 'seasonal_naive', 'drift', 'ses', 'ets', 'arima'):
+            forecasters.make(nome).fit(df_train).predict(df_test)
+    return baselines
+
+
+def _stage_render_modelagem(ctx):
+    df_train, df_test = ctx.prophet_frames
+    fcst = ctx.modelo.predict(df_test)
+    df_real = pd.concat([df_train, df_test])
+
+    def render():
+        charts.forecast_chart(df_real, fcst, ctx.modelo.changepoints).to_json()
+        for coluna in ('trend', 'weekly', 'yearly'):
+            charts.component_chart(fcst, coluna, coluna, coluna).to_json()
+    return render
+
+
+# (página, etapa, preparo, maior escala viável). O Spearman móvel anda ponto a
+# ponto em Python: cerca de 80 s por execução já em 100x.
+STAGES = [
+    ('principal', 'load_csv', _stage_load_csv, 1000),
+    ('principal', 'load_cache', _stage_load_cache, 1000),
+    ('principal', 'range_index', _stage_range_index, 1000),
+    ('principal', 'range_query', _stage_range_query, 1000),
+    ('principal', 'downsample', _stage_downsample, 1000),
+    ('principal', 'render', _stage_render_principal, 1000),
+    ('analise', 'align', _stage_align, 1000),
+    ('analise', 'stats', _stage_stats, 100),
+    ('analise', 'rolling', _stage_rolling, 10),
+    ('analise', 'outliers', _stage_outliers, 1000),
+    ('analise', 'render', _stage_render_analise, 100),
+    ('modelagem', 'fit', _stage_fit, 10),
+    ('modelagem', 'predict', _stage_predict, 10),
+    ('modelagem', 'forecast', _stage_forecast, 10),
+    ('modelagem', 'forecast_point', _stage_forecast_point, 10),
+    ('modelagem', 'baselines', _stage_baselines, 10),
+    ('modelagem', 'render', _stage_render_modelagem, 10),
+]
+
+
+def measure(preparo, ctx, repeat):
+    funcao = preparo(ctx)
+    tempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': min(tempos), 'peak_mb': pico / 2 ** 20}
+
+
+def compare(resultados, baseline, tolerancia):
+    regressoes = []
+    for chave, atual in resultados.items():
+        anterior = baseline.get(chave)
+        if anterior is None:
+            continue
+        for metrica in ('seconds', 'peak_mb'):
+            # Ignora variações absolutas irrelevantes (ruído de medição em etapas muito curtas).
+            piso = 0.005 if metrica == 'seconds' else 1.0
+            if atual[metrica] > anterior[metrica] * (1 + tolerancia) and atual[metrica] - anterior[metrica] > piso:
+                regressoes.append(f"{chave} {metrica}: {anterior[metrica]:.4g} -> {atual[metrica]:.4g}")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', default='1,10', help='escalas separadas por vírgula (1,10,100,1000)')
+    parser.add_argument('--stages', default='principal,analise,modelagem', help='páginas a medir')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--tolerance', type=float, default=0.5, help='folga relativa sobre o baseline')
+    parser.add_argument('--output', help='grava os resultados em JSON')
+    parser.add_argument('--save-baseline', action='store_true', help='grava os resultados como baseline.json')
+    args = parser.parse_args()
+
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    escalas = [int(escala) for escala in args.scales.split(',')]
+    paginas = set(args.stages.split(','))
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for escala in escalas:
+            ctx = Contexto(escala, tmp_dir)
+            for pagina, etapa, preparo, escala_maxima in STAGES:
+                if pagina not in paginas or escala > escala_maxima:
+                    continue
+                chave = f"{pagina}.{etapa}@{escala}x"
+                resultados[chave] = medida = measure(preparo, ctx, args.repeat)
+                print(f"{chave:<32} {medida['seconds'] * 1000:10.2f} ms {medida['peak_mb']:10.1f} MB", flush=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(resultados, indent=2) + "\n")
+    if args.save_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        BASELINE_PATH.write_text(json.dumps({**baseline, **resultados}, indent=2) + "\n")
+        print(f"Baseline gravado em {BASELINE_PATH}")
+        return
+
+    if BASELINE_PATH.exists():
+        regressoes = compare(resultados, json.loads(BASELINE_PATH.read_text()), args.tolerance)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao}")
+        sys.exit(1 if regressoes else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,208 +1,247 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from prophet import Prophet
-from sklearn.metrics import mean_squared_error, mean_absolute_error
-import plotly.graph_objects as go
-import plotly.express as px
+
+from petroleo import artifacts, charts, data, forecasters, instrument, series
 
 st.set_page_config(page_title="Modelagem e Previsão", layout="wide")
 
-st.title('📈 Modelagem e Previsão do Preço do Petróleo Brent')
+# Os ajustes rodam fora das requisições (``python -m petroleo.artifacts`` e
+# ``python -m petroleo.series``); aqui só se leem os resultados. Um
+# FileNotFoundError não entra no cache, então a página os encontra assim que
+# forem gerados.
+@st.cache_data(show_spinner="Carregando os artefatos do modelo...")
+@instrument.tracks_cache
+def load_artifacts(versao):
+    return artifacts.load(versao)
+
+@st.cache_data(show_spinner="Carregando as séries...")
+@instrument.tracks_cache
+def load_series_results(versoes):
+    return {series_id: series.load_results(series_id, versao) for series_id, versao in versoes}
+
+
+with instrument.page('modelagem'):
+    st.title('📈 Modelagem e Previsão do Preço do Petróleo Brent')
 
-st.write("""
+    st.write("""
 
-O modelo de previsão desenvolvido com o **Prophet**, conforme abaixo, fornece insights valiosos, embora seja importante considerar que previsões financeiras estão sujeitas a incertezas.
+    O modelo de previsão desenvolvido com o **Prophet**, conforme abaixo, fornece insights valiosos, embora seja importante considerar que previsões financeiras estão sujeitas a incertezas.
 
 
-""")
+    """)
 
-def mean_absolute_percentage_error(y_true, y_pred):
-    y_true, y_pred = np.array(y_true), np.array(y_pred)
-    non_zero = y_true != 0
-    return np.mean(np.abs((y_true[non_zero] - y_pred[non_zero]) / y_true[non_zero])) * 100
+    try:
+        with instrument.stage('versao'):
+            versao, prophet_params = artifacts.current_version()
+    except FileNotFoundError:
+        st.error(f"O arquivo '{data.PETROLEO_CSV}' não foi encontrado. Por favor, verifique se o arquivo está no diretório correto.")
+        st.stop()
 
-@st.cache_data
-def load_petroleo_data(file_path):
     try:
-        df = pd.read_csv(file_path, encoding="windows-1252", sep=";")
+        with instrument.stage('artefatos', cached=True):
+            artefatos = load_artifacts(versao)
     except FileNotFoundError:
-        st.error(f"O arquivo '{file_path}' não foi encontrado. Por favor, verifique se o arquivo está no diretório correto.")
+        st.info(
+            "Os artefatos do modelo para a versão atual dos dados ainda não foram gerados. "
+            "Rode `python -m petroleo.artifacts` e recarregue a página."
+        )
         st.stop()
-    df = df.dropna()
-    df['DATA'] = pd.to_datetime(df['DATA'], dayfirst=True)
-    df["Preço"] = df["Preço - petróleo bruto - Brent (FOB)"].str.replace(",", ".").astype("float")
-    df = df[['DATA', 'Preço']]
-    return df
-
-df_preco_petroleo = load_petroleo_data('tabela_dxgvTable.csv')
-
-df_preco_petroleo_renomeado = df_preco_petroleo.rename(columns={'DATA': 'ds', 'Preço': 'y'})
-
-df_preco_petroleo_renomeado = df_preco_petroleo_renomeado[
-    (df_preco_petroleo_renomeado['ds'] >= '2019-11-25') &
-    (df_preco_petroleo_renomeado['ds'] <= '2024-11-25')
-]
-
-split_date = '2023-11-25'
-df_train_prophet = df_preco_petroleo_renomeado[df_preco_petroleo_renomeado['ds'] <= split_date].copy()
-df_test_prophet = df_preco_petroleo_renomeado[df_preco_petroleo_renomeado['ds'] > split_date].copy()
-
-model = Prophet(daily_seasonality=True)
-model.fit(df_train_prophet)
-
-df_test_fcst = model.predict(df_test_prophet)
-
-previsao = df_test_fcst[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
-
-rmse = np.sqrt(mean_squared_error(y_true=df_test_prophet['y'], y_pred=df_test_fcst['yhat']))
-mae = mean_absolute_error(y_true=df_test_prophet['y'], y_pred=df_test_fcst['yhat'])
-mape = mean_absolute_percentage_error(y_true=df_test_prophet['y'], y_pred=df_test_fcst['yhat'])
-
-df_real = pd.concat([df_train_prophet, df_test_prophet])
-
-fig = go.Figure()
-
-fig.add_trace(go.Scatter(
-    x=df_real['ds'],
-    y=df_real['y'],
-    mode='lines',
-    name='Valores Reais',
-    line=dict(color='#6495ED')
-))
-
-fig.add_trace(go.Scatter(
-    x=previsao['ds'],
-    y=previsao['yhat'],
-    mode='lines',
-    name='Previsões',
-    line=dict(color='#FF69B4')
-))
-
-fig.add_trace(go.Scatter(
-    x=previsao['ds'],
-    y=previsao['yhat_upper'],
-    mode='lines',
-    name='Intervalo de Confiança Superior',
-    line=dict(color='#FF69B4', width=0),
-    showlegend=False
-))
-
-fig.add_trace(go.Scatter(
-    x=previsao['ds'],
-    y=previsao['yhat_lower'],
-    mode='lines',
-    name='Intervalo de Confiança Inferior',
-    line=dict(color='#FF69B4', width=0),
-    fill='tonexty',
-    fillcolor='rgba(255,105,180,0.2)',
-    showlegend=False
-))
-
-for cp in model.changepoints:
-    fig.add_vline(x=cp, line=dict(color='black', dash='dash'), opacity=0.5)
-
-fig.update_layout(
-    title={
-        'text': '📈 Previsão do Preço do Petróleo Bruto Brent (FOB)',
-        'y':0.95,
-        'x':0.5,
-        'xanchor': 'center',
-        'yanchor': 'top',
-        'font': {'size': 24}
-    },
-    xaxis_title='🗓️ Data',
-    yaxis_title='💲 Preço (USD)',
-    legend=dict(x=0.01, y=0.99),
-    template='plotly_white',
-    height=600
-)
-
-st.plotly_chart(fig, use_container_width=True)
-
-st.subheader("📊 Métricas de Desempenho do Modelo")
-st.markdown(f"""
-- **Erro Quadrático Médio (RMSE):** {rmse:.2f}
-- **Erro Absoluto Médio (MAE):** {mae:.2f}
-- **Erro Percentual Absoluto Médio (MAPE):** {mape:.2f}%
-""")
-
-st.subheader("📉 Componentes da Série Temporal")
-
-fig_trend = px.line(df_test_fcst, x='ds', y='trend', title='🔄 Trend')
-fig_trend.update_layout(
-    xaxis_title='🗓️ Data',
-    yaxis_title='📈 Trend',
-    template='plotly_white',
-    height=400
-)
-
-fig_weekly = px.line(df_test_fcst, x='ds', y='weekly', title='📅 Sazonalidade Semanal')
-fig_weekly.update_layout(
-    xaxis_title='🗓️ Data',
-    yaxis_title='📆 Weekly',
-    template='plotly_white',
-    height=400
-)
-
-fig_yearly = px.line(df_test_fcst, x='ds', y='yearly', title='🌐 Sazonalidade Anual')
-fig_yearly.update_layout(
-    xaxis_title='🗓️ Data',
-    yaxis_title='📆 Yearly',
-    template='plotly_white',
-    height=400
-)
-
-st.plotly_chart(fig_trend, use_container_width=True)
-st.plotly_chart(fig_weekly, use_container_width=True)
-st.plotly_chart(fig_yearly, use_container_width=True)
-
-
-st.markdown(f"""
-### 1. 🔍 **Desempenho do Modelo de Previsão**
-    
-O modelo **Prophet** apresentou as seguintes métricas de desempenho no conjunto de teste:
-    
-- **Erro Quadrático Médio (RMSE):** {rmse:.2f}
-- **Erro Absoluto Médio (MAE):** {mae:.2f}
-- **Erro Percentual Absoluto Médio (MAPE):** {mape:.2f}%
-    
-Estas métricas indicam que o modelo possui uma precisão razoável na previsão dos preços do petróleo Brent. O **RMSE** e o **MAE** fornecem uma medida da magnitude dos erros de previsão, enquanto o **MAPE** oferece uma perspectiva percentual da precisão relativa das previsões.
-
-- O modelo é capaz de capturar a tendência geral dos preços, mas ainda apresenta variações que podem ser atribuídas a fatores não incluídos no modelo.
-- O **MAPE** sugere que, em média, as previsões estão a **{mape:.2f}%** do valor real, o que é aceitável para séries temporais financeiras altamente voláteis.
-    
-""")
-
-st.markdown("""
----
-### 2. 🌟 **Identificação de Pontos de Mudança Significativos**
-    
-O **Prophet** identificou vários pontos de mudança (changepoints) ao longo da série temporal dos preços do petróleo Brent. Estes pontos indicam mudanças significativas na tendência dos preços, que podem estar associadas a eventos específicos no mercado ou na geopolítica.
-    
-- **Sensibilidade a Eventos:** O modelo é sensível a mudanças abruptas nos preços, capturando rapidamente as novas tendências após eventos disruptivos.
-- **Análise de Tendências:** A identificação dos changepoints permite uma análise mais detalhada das causas subjacentes às mudanças nos preços, facilitando a compreensão das dinâmicas do mercado.
-    
-""")
-
-st.markdown("""
----
-### 3. 📉 **Limitações do Modelo de Regressão Linear**
-    
-Embora o modelo de regressão linear desenvolvido explique aproximadamente **22.33%** da variação na cotação do dólar com base nos preços do petróleo Brent, o coeficiente de determinação (**R²**) relativamente baixo indica que outros fatores econômicos, políticos e sociais também influenciam a taxa de câmbio. Para aprimorar o modelo, é recomendável incorporar variáveis macroeconômicas adicionais, como taxas de juros, inflação e indicadores econômicos globais.
-    
-- **Fatores Multivariados:** A cotação do dólar é influenciada por múltiplos fatores além dos preços do petróleo.
-- **Limitações do Modelo Atual:** O modelo atual possui limitações na captura da complexidade das relações econômicas.
-    
-""")
-
-st.markdown("""
----
-### 4. 💡 **Implicações Estratégicas para Investidores e Policymakers**
-    
-As previsões fornecidas pelo modelo podem auxiliar investidores e formuladores de políticas na tomada de decisões informadas. Compreender as tendências futuras dos preços do petróleo Brent pode orientar estratégias de investimento e políticas econômicas, permitindo uma melhor gestão de riscos e aproveitamento de oportunidades no mercado energético.
-    
-- **Planejamento Financeiro:** Investidores podem utilizar as previsões para ajustar suas estratégias de investimento, considerando períodos de alta e baixa nos preços do petróleo.
-- **Políticas Econômicas:** Governos e entidades reguladoras podem basear suas políticas energéticas e econômicas nas tendências previstas, visando estabilizar o mercado e mitigar riscos.
-
-""")
\ No newline at end of file
+
+    df_real = artefatos['history']
+    previsao = artefatos['forecast']
+    df_test_fcst = artefatos['components']
+    changepoints = artefatos['changepoints']
+
+    metricas = artefatos['metrics']['metrics']
+    rmse, mae, mape = metricas['rmse'], metricas['mae'], metricas['mape']
+
+    with instrument.stage('render_previsao'):
+        fig = charts.forecast_chart(df_real, previsao, changepoints)
+
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("📊 Métricas de Desempenho do Modelo")
+    st.markdown(f"""
+    - **Erro Quadrático Médio (RMSE):** {rmse:.2f}
+    - **Erro Absoluto Médio (MAE):** {mae:.2f}
+    - **Erro Percentual Absoluto Médio (MAPE):** {mape:.2f}%
+    """)
+    regressores = artefatos['metrics']['settings'].get('regressors') or ['nenhum']
+    st.caption(f"Hiperparâmetros do Prophet: {prophet_params} · Regressores: {', '.join(regressores)}")
+
+    st.subheader("🔮 Previsão Futura")
+    st.markdown("""
+    Para projetar os próximos dias úteis, o modelo é reajustado com toda a janela 2019–2024, e a previsão começa logo após a última cotação.
+    """)
+
+    df_futuro = artefatos['future']
+    horizonte_futuro = st.select_slider('Horizonte da previsão (dias)', options=artefatos['metrics']['settings']['forecast_horizons'], value=90)
+    df_futuro = df_futuro[df_futuro['horizon_days'] <= horizonte_futuro]
+
+    with instrument.stage('render_futuro'):
+        fig_futuro = charts.future_chart(df_real[df_real['ds'] > df_real['ds'].max() - pd.Timedelta(days=365)], df_futuro)
+
+        st.plotly_chart(fig_futuro, use_container_width=True)
+
+    st.subheader("🔁 Backtesting com Origem Móvel")
+    st.markdown("""
+    Um único corte treino/teste pode ser otimista ou pessimista por acaso. No backtesting, o modelo é reajustado em vários cortes ao longo da janela 2019–2024 e avaliado nos dias seguintes a cada corte, com as métricas agregadas por horizonte de previsão.
+    """)
+
+    col_janela, col_horizonte = st.columns(2)
+    with col_janela:
+        janela_backtest = st.radio('Janela de treino', ['expanding', 'rolling'], format_func={'expanding': 'Expansível', 'rolling': 'Móvel (365 dias)'}.get, horizontal=True)
+    with col_horizonte:
+        horizonte_backtest = st.select_slider('Horizonte (dias)', options=[30, 60, 90, 180], value=90)
+
+    df_backtest = artefatos['backtest']
+    df_metricas_horizonte = df_backtest[
+        (df_backtest['window'] == janela_backtest) &
+        (df_backtest['horizon'] - 7 < horizonte_backtest)
+    ]
+
+    with instrument.stage('render_backtest'):
+        fig_backtest = charts.backtest_chart(df_metricas_horizonte)
+
+        st.plotly_chart(fig_backtest, use_container_width=True)
+
+    st.dataframe(
+        df_metricas_horizonte.drop(columns=['window', 'cutoffs']).rename(columns={'horizon': 'Horizonte (dias)', 'rmse': 'RMSE', 'mae': 'MAE', 'mape': 'MAPE (%)', 'n': 'Observações'}),
+        hide_index=True,
+        use_container_width=True
+    )
+
+    st.subheader("⚖️ Comparação com Outros Modelos")
+    st.markdown("""
+    O Prophet é comparado, no mesmo período de teste, com modelos mais simples: os ingênuos (repetem o último valor, a última semana ou a tendência média), a suavização exponencial, o ETS e o ARIMA. A tabela mostra o erro de cada um e o tempo de CPU gasto no ajuste e na previsão.
+
+    O **Prophet + dólar** usa a cotação do dólar como regressor. No teste ele recebe a cotação que de fato ocorreu, então mede quanto o dólar explica do preço, e não a previsão que seria feita sem conhecê-lo.
+    """)
+
+    df_modelos = artefatos['models']
+    modelo_escolhido = st.selectbox('Modelo', df_modelos['model'].tolist(), index=df_modelos['model'].tolist().index('prophet'), format_func=forecasters.NOMES.get)
+
+    df_previsao_modelo = artefatos['model_forecasts']
+    df_previsao_modelo = df_previsao_modelo[df_previsao_modelo['model'] == modelo_escolhido]
+
+    with instrument.stage('render_modelos'):
+        fig_modelo = charts.forecast_chart(df_real, df_previsao_modelo, [])
+
+        st.plotly_chart(fig_modelo, use_container_width=True)
+
+    st.dataframe(
+        df_modelos.assign(model=df_modelos['model'].map(forecasters.NOMES)).rename(columns={
+            'model': 'Modelo', 'rmse': 'RMSE', 'mae': 'MAE', 'mape': 'MAPE (%)',
+            'fit_cpu_s': 'Ajuste (s de CPU)', 'predict_cpu_s': 'Previsão (s de CPU)',
+        }),
+        hide_index=True,
+        use_container_width=True
+    )
+
+    st.subheader("🌐 Dólar e Petróleo em Reais")
+    st.markdown("""
+    Com os mesmos hiperparâmetros e datas de corte, o Prophet também é ajustado para a cotação do dólar e para o preço do Brent em reais (preço em dólares × cotação do dia). Cada série é ajustada em um processo separado e só é reajustada quando os seus dados mudam.
+    """)
+
+    with instrument.stage('versao_series'):
+        versoes_series = tuple((series_id, series.series_version(series_id, prophet_params)) for series_id in series.SERIES)
+    try:
+        with instrument.stage('series', cached=True):
+            resultados_series = load_series_results(versoes_series)
+    except FileNotFoundError:
+        resultados_series = None
+        st.info(
+            "As previsões das séries para a versão atual dos dados ainda não foram geradas. "
+            "Rode `python -m petroleo.series` e recarregue a página."
+        )
+
+    if resultados_series is not None:
+        serie_escolhida = st.selectbox('Série', list(series.SERIES), format_func=lambda series_id: series.SERIES[series_id]['label'])
+        resultado_serie = resultados_series[serie_escolhida]
+        configuracao_serie = series.SERIES[serie_escolhida]
+        metricas_serie = resultado_serie['metrics']['metrics']
+        df_historico_serie = resultado_serie['history']
+
+        with instrument.stage('render_series'):
+            fig_serie = charts.forecast_chart(
+                df_historico_serie, resultado_serie['forecast'], [],
+                titulo=f"📈 {configuracao_serie['label']}", yaxis_title=f"💲 {configuracao_serie['unit']}"
+            )
+            fig_serie_futuro = charts.future_chart(
+                df_historico_serie[df_historico_serie['ds'] > df_historico_serie['ds'].max() - pd.Timedelta(days=365)],
+                resultado_serie['future'][resultado_serie['future']['horizon_days'] <= horizonte_futuro],
+                yaxis_title=f"💲 {configuracao_serie['unit']}"
+            )
+
+            st.plotly_chart(fig_serie, use_container_width=True)
+            st.plotly_chart(fig_serie_futuro, use_container_width=True)
+
+        st.markdown(f"""
+        - **RMSE:** {metricas_serie['rmse']:.2f}
+        - **MAE:** {metricas_serie['mae']:.2f}
+        - **MAPE:** {metricas_serie['mape']:.2f}%
+        """)
+
+    st.subheader("📉 Componentes da Série Temporal")
+
+    # Uma sazonalidade desligada nos hiperparâmetros ajustados não gera coluna
+    # nos artefatos (ver ``artifacts.COMPONENTES``).
+    componentes = [
+        ('trend', '🔄 Trend', '📈 Trend'),
+        ('weekly', '📅 Sazonalidade Semanal', '📆 Weekly'),
+        ('yearly', '🌐 Sazonalidade Anual', '📆 Yearly'),
+    ]
+    with instrument.stage('render_componentes'):
+        for coluna, titulo, rotulo in componentes:
+            if coluna in df_test_fcst.columns:
+                st.plotly_chart(charts.component_chart(df_test_fcst, coluna, titulo, rotulo), use_container_width=True)
+
+
+    st.markdown(f"""
+    ### 1. 🔍 **Desempenho do Modelo de Previsão**
+
+    O modelo **Prophet** apresentou as seguintes métricas de desempenho no conjunto de teste:
+
+    - **Erro Quadrático Médio (RMSE):** {rmse:.2f}
+    - **Erro Absoluto Médio (MAE):** {mae:.2f}
+    - **Erro Percentual Absoluto Médio (MAPE):** {mape:.2f}%
+
+    Estas métricas indicam que o modelo possui uma precisão razoável na previsão dos preços do petróleo Brent. O **RMSE** e o **MAE** fornecem uma medida da magnitude dos erros de previsão, enquanto o **MAPE** oferece uma perspectiva percentual da precisão relativa das previsões.
+
+    - O modelo é capaz de capturar a tendência geral dos preços, mas ainda apresenta variações que podem ser atribuídas a fatores não incluídos no modelo.
+    - O **MAPE** sugere que, em média, as previsões estão a **{mape:.2f}%** do valor real, o que é aceitável para séries temporais financeiras altamente voláteis.
+
+    """)
+
+    st.markdown("""
+    ---
+    ### 2. 🌟 **Identificação de Pontos de Mudança Significativos**
+
+    O **Prophet** identificou vários pontos de mudança (changepoints) ao longo da série temporal dos preços do petróleo Brent. Estes pontos indicam mudanças significativas na tendência dos preços, que podem estar associadas a eventos específicos no mercado ou na geopolítica.
+
+    - **Sensibilidade a Eventos:** O modelo é sensível a mudanças abruptas nos preços, capturando rapidamente as novas tendências após eventos disruptivos.
+    - **Análise de Tendências:** A identificação dos changepoints permite uma análise mais detalhada das causas subjacentes às mudanças nos preços, facilitando a compreensão das dinâmicas do mercado.
+
+    """)
+
+    st.markdown("""
+    ---
+    ### 3. 📉 **Limitações do Modelo de Regressão Linear**
+
+    Embora o modelo de regressão linear desenvolvido explique aproximadamente **22.32%** da variação na cotação do dólar com base nos preços do petróleo Brent, o coeficiente de determinação (**R²**) relativamente baixo indica que outros fatores econômicos, políticos e sociais também influenciam a taxa de câmbio. Para aprimorar o modelo, é recomendável incorporar variáveis macroeconômicas adicionais, como taxas de juros, inflação e indicadores econômicos globais.
+
+    - **Fatores Multivariados:** A cotação do dólar é influenciada por múltiplos fatores além dos preços do petróleo.
+    - **Limitações do Modelo Atual:** O modelo atual possui limitações na captura da complexidade das relações econômicas.
+
+    """)
+
+    st.markdown("""
+    ---
+    ### 4. 💡 **Implicações Estratégicas para Investidores e Policymakers**
+
+    As previsões fornecidas pelo modelo podem auxiliar investidores e formuladores de políticas na tomada de decisões informadas. Compreender as tendências futuras dos preços do petróleo Brent pode orientar estratégias de investimento e políticas econômicas, permitindo uma melhor gestão de riscos e aproveitamento de oportunidades no mercado energético.
+
+    - **Planejamento Financeiro:** Investidores podem utilizar as previsões para ajustar suas estratégias de investimento, considerando períodos de alta e baixa nos preços do petróleo.
+    - **Políticas Econômicas:** Governos e entidades reguladoras podem basear suas políticas energéticas e econômicas nas tendências previstas, visando estabilizar o mercado e mitigar riscos.
+
+    """)
@@ -5,7 +5,7 @@ st.subheader("📊 Insights da Análise")
 st.markdown("""
 ### 1. 🔗 **Correlação Positiva Moderada entre Preço do Petróleo e Cotação do Dólar**
 
-A análise de correlação revelou uma relação positiva moderada entre o preço do petróleo Brent e a cotação do dólar americano, com coeficientes de Pearson (0.4725) e Spearman (0.5547). Essa correlação sugere que, em geral, aumentos nos preços do petróleo estão associados a uma valorização do dólar. Essa interdependência pode ser atribuída à demanda por dólares para transações em petróleo, influenciando a taxa de câmbio.
+A análise de correlação revelou uma relação positiva moderada entre o preço do petróleo Brent e a cotação do dólar americano, com coeficientes de Pearson (0.4725) e Spearman (0.5691). Essa correlação sugere que, em geral, aumentos nos preços do petróleo estão associados a uma valorização do dólar. Essa interdependência pode ser atribuída à demanda por dólares para transações em petróleo, influenciando a taxa de câmbio.
 
 **Conclusões:**
 - **Influência Mútua:** Flutuações no preço do petróleo podem afetar diretamente a força do dólar, e vice-versa.
@@ -35,7 +35,7 @@ A detecção de outliers no histórico de preços do petróleo Brent está forte
 
 ### 3. 📉 **Poder Preditivo Limitado do Modelo de Regressão Linear**
 
-O modelo de regressão linear desenvolvido explica aproximadamente 22.33% da variação na cotação do dólar com base nos preços do petróleo Brent. Embora a relação seja estatisticamente significativa, o coeficiente de determinação (R²) relativamente baixo indica que outros fatores econômicos, políticos e sociais também influenciam a taxa de câmbio. Para aprimorar o modelo, é recomendável incorporar variáveis macroeconômicas adicionais, como taxas de juros, inflação e indicadores econômicos globais.
+O modelo de regressão linear desenvolvido explica aproximadamente 22.32% da variação na cotação do dólar com base nos preços do petróleo Brent. Embora a relação seja estatisticamente significativa, o coeficiente de determinação (R²) relativamente baixo indica que outros fatores econômicos, políticos e sociais também influenciam a taxa de câmbio. Para aprimorar o modelo, é recomendável incorporar variáveis macroeconômicas adicionais, como taxas de juros, inflação e indicadores econômicos globais.
 
 **Conclusões:**
 - **Fatores Multivariados:** A cotação do dólar é influenciada por múltiplos fatores além dos preços do petróleo.
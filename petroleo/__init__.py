@@ -0,0 +1,17 @@
+"""Rotinas compartilhadas pelas páginas do Tech Challenge 4 (Preço do Petróleo Brent)."""
+import os
+import threading
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("PETROLEO_CACHE_DIR", ".cache"))
+
+
+def write_text_atomic(path, text):
+    """Grava ``text`` em ``path`` via arquivo temporário + ``os.replace``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Temporário por processo e por thread: escritas simultâneas não se misturam.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,4 @@
+"""``python -m petroleo``: executa a análise completa (ver ``petroleo.pipeline``)."""
+from petroleo.pipeline import main
+
+main()
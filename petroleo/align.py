@@ -0,0 +1,80 @@
+"""Alinhamento das séries do IPEA por data (as-of join).
+
+Os calendários do Brent (pregões em Londres) e do dólar (dias úteis no
+Brasil) não coincidem, e um ``merge`` exato descarta os dias que existem em
+só uma das séries. Aqui cada série é levada para um calendário comum pelo
+valor mais recente (ou mais próximo) dentro de uma tolerância, usando
+chaves int64 ordenadas e ``searchsorted``.
+"""
+import numpy as np
+import pandas as pd
+
+DIRECTIONS = ('backward', 'forward', 'nearest')
+CALENDARS = ('union', 'intersection', 'left', 'right')
+FILLS = ('drop', 'keep')
+
+
+def _keys(datas):
+    return np.asarray(datas, dtype='datetime64[ns]').view(np.int64)
+
+
+def asof_indices(chaves, alvo, tolerance, direction='backward'):
+    """Posição em ``chaves`` (ordenadas) casada com cada valor de ``alvo``; -1 sem par."""
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction deve ser um de {DIRECTIONS}, não '{direction}'")
+    n = len(chaves)
+    if n == 0:
+        return np.full(len(alvo), -1)
+    anterior = np.searchsorted(chaves, alvo, side='right') - 1
+    posterior = np.searchsorted(chaves, alvo, side='left')
+    if direction == 'backward':
+        indices = anterior
+    elif direction == 'forward':
+        indices = np.where(posterior < n, posterior, -1)
+    else:
+        dist_anterior = np.where(anterior >= 0, alvo - chaves[np.maximum(anterior, 0)], np.iinfo(np.int64).max)
+        dist_posterior = np.where(posterior < n, chaves[np.minimum(posterior, n - 1)] - alvo, np.iinfo(np.int64).max)
+        indices = np.where(dist_posterior < dist_anterior, posterior, anterior)
+        indices = np.where((anterior < 0) & (posterior >= n), -1, indices)
+    distancia = np.abs(alvo - chaves[np.clip(indices, 0, n - 1)])
+    return np.where((indices >= 0) & (distancia <= tolerance), indices, -1)
+
+
+def align(left, right, on='DATA', calendar='union', tolerance='3D', direction='backward', fill='drop'):
+    """Combina ``left`` e ``right`` (ordenados por ``on``) em um calendário comum.
+
+    ``calendar`` define as datas do resultado (união, interseção ou as de um
+    dos lados); cada lado é preenchido por as-of com ``direction`` e
+    ``tolerance``. Com ``fill='drop'`` as datas sem par em algum dos lados
+    são descartadas; com ``fill='keep'`` ficam com ``NaN``.
+    """
+    if calendar not in CALENDARS:
+        raise ValueError(f"calendar deve ser um de {CALENDARS}, não '{calendar}'")
+    if fill not in FILLS:
+        raise ValueError(f"fill deve ser um de {FILLS}, não '{fill}'")
+    chaves_left, chaves_right = _keys(left[on]), _keys(right[on])
+    if calendar == 'union':
+        alvo = np.union1d(chaves_left, chaves_right)
+    elif calendar == 'intersection':
+        alvo = np.intersect1d(chaves_left, chaves_right)
+    else:
+        alvo = chaves_left if calendar == 'left' else chaves_right
+    tolerancia = pd.Timedelta(tolerance).value
+
+    colunas = {on: alvo.view('datetime64[ns]')}
+    encontrados = np.ones(len(alvo), dtype=bool)
+    for df, chaves in ((left, chaves_left), (right, chaves_right)):
+        indices = asof_indices(chaves, alvo, tolerancia, direction)
+        casou = indices >= 0
+        encontrados &= casou
+        for coluna in df.columns.drop(on):
+            valores = df[coluna].to_numpy()
+            resultado = valores[np.maximum(indices, 0)].astype(np.result_type(valores.dtype, np.float64))
+            resultado[~casou] = np.nan
+            colunas[coluna] = resultado
+
+    df = pd.DataFrame(colunas)
+    if fill == 'drop':
+        df = df[encontrados].reset_index(drop=True)
+    df[on] = df[on].astype(left[on].dtype)
+    return df
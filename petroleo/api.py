@@ -0,0 +1,305 @@
+"""API HTTP/JSON com a previsão, os outliers e a correlação petróleo–dólar.
+
+Aplicação ASGI sem framework, servida pelo ``uvicorn``:
+
+    python -m petroleo.api --port 8000
+    curl 'http://127.0.0.1:8000/forecast?horizon=30'
+
+Rotas (todas ``GET``):
+
+- ``/forecast?horizon=90``: previsão futura do Brent e métricas do modelo
+  (artefatos de ``petroleo.artifacts``);
+- ``/series/<série>?horizon=90``: o mesmo para as séries de ``petroleo.series``;
+- ``/outliers?desde=aaaa-mm-dd``: outliers do Brent com z-score e evento;
+- ``/correlation?janela=252``: Pearson/Spearman/OLS e o último valor da
+  correlação móvel;
+- ``/health``.
+
+As respostas saem dos resultados pré-calculados (artefatos, séries e o cache
+de ``petroleo.dag``). O JSON de cada rota é montado uma vez por versão dos
+dados e guardado em memória com o seu ``ETag``; um ``If-None-Match`` igual
+recebe 304 sem corpo. As versões são conferidas no máximo a cada
+``version_ttl`` segundos, fora do event loop. Quando os artefatos da versão
+atual ainda não existem, o ajuste roda em um pool de processos e requisições
+simultâneas esperam o mesmo ajuste.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+from petroleo import artifacts, pipeline, series, tuning
+
+VERSION_TTL = 2.0
+MAX_RESPONSES = 256
+
+
+def _records(df):
+    """Linhas de ``df`` como dicts, com datas ``aaaa-mm-dd`` e ``None`` no lugar de NaN."""
+    df = df.copy()
+    for coluna in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[coluna]):
+            df[coluna] = df[coluna].dt.strftime('%Y-%m-%d')
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def _build_artifacts(params):
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    artifacts.build(params)
+
+
+def _build_series(series_id, params):
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    series.build_all([series_id], params=params)
+
+
+def _current_versions():
+    versao, params = artifacts.current_version()
+    params_series = tuning.load_best_params()
+    return {
+        'artefatos': (versao, params),
+        'series': {series_id: series.series_version(series_id, params_series) for series_id in series.SERIES},
+        'series_params': params_series,
+        'grafo': pipeline.analysis_graph(),
+    }
+
+
+class HTTPError(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _int_param(query, nome, padrao, permitidos=None):
+    valor = query.get(nome, [padrao])[0]
+    try:
+        valor = int(valor)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"Parâmetro '{nome}' deve ser um inteiro") from None
+    if permitidos is not None and valor not in permitidos:
+        raise HTTPError(400, f"Parâmetro '{nome}' deve ser um de {sorted(permitidos)}")
+    return valor
+
+
+class API:
+    """Aplicação ASGI; ``max_workers`` é o tamanho do pool de processos dos ajustes."""
+
+    def __init__(self, max_workers=1, version_ttl=VERSION_TTL):
+        self.max_workers = max_workers
+        self.version_ttl = version_ttl
+        self.pool = None
+        self._versoes = None
+        self._versoes_em = 0.0
+        self._versoes_lock = None
+        self._respostas = {}
+        self._ajustes = {}
+        self.routes = {
+            '/health': self.health,
+            '/forecast': self.forecast,
+            '/outliers': self.outliers,
+            '/correlation': self.correlation,
+        }
+
+    async def startup(self):
+        # ``spawn``: o processo do servidor tem threads, e ``fork`` com threads
+        # pode herdar locks travados.
+        self.pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+        self._versoes_lock = asyncio.Lock()
+
+    async def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def versions(self):
+        """Versões atuais dos dados, recalculadas (em uma thread) após ``version_ttl``."""
+        async with self._versoes_lock:
+            if self._versoes is None or time.monotonic() - self._versoes_em > self.version_ttl:
+                self._versoes = await asyncio.to_thread(_current_versions)
+                self._versoes_em = time.monotonic()
+            return self._versoes
+
+    async def _fit(self, chave, funcao, *args):
+        """Roda ``funcao(*args)`` no pool; chamadas com a mesma ``chave`` esperam o mesmo ajuste."""
+        futuro = self._ajustes.get(chave)
+        if futuro is None:
+            futuro = asyncio.get_running_loop().run_in_executor(self.pool, funcao, *args)
+            self._ajustes[chave] = futuro
+            futuro.add_done_callback(lambda _: self._ajustes.pop(chave, None))
+        await futuro
+
+    async def _cached(self, chave, montar):
+        """``(etag, corpo)`` de ``chave``; ``montar()`` roda em uma thread só na primeira vez."""
+        resposta = self._respostas.get(chave)
+        if resposta is None:
+            corpo = json.dumps(await asyncio.to_thread(montar), ensure_ascii=False).encode()
+            resposta = (f'"{hashlib.sha256(corpo).hexdigest()[:20]}"', corpo)
+            if len(self._respostas) >= MAX_RESPONSES:
+                self._respostas.pop(next(iter(self._respostas)))
+            self._respostas[chave] = resposta
+        return resposta
+
+    async def health(self, query):
+        return await self._cached(('health',), lambda: {'status': 'ok'})
+
+    async def forecast(self, query):
+        versoes = await self.versions()
+        versao, params = versoes['artefatos']
+        horizonte = _int_param(query, 'horizon', 90)
+        if not (Path(artifacts.ARTIFACTS_DIR) / versao).exists():
+            await self._fit(('artefatos', versao), _build_artifacts, params)
+
+        def montar():
+            artefatos = artifacts.load(versao)
+            df_futuro = artefatos['future']
+            return {
+                'version': versao,
+                'params': params,
+                'metrics': artefatos['metrics']['metrics'],
+                'horizon_days': horizonte,
+                'forecast': _records(df_futuro[df_futuro['horizon_days'] <= horizonte]),
+            }
+
+        return await self._cached(('forecast', versao, horizonte), montar)
+
+    async def series(self, query, series_id):
+        versoes = await self.versions()
+        if series_id not in versoes['series']:
+            raise HTTPError(404, f"Série desconhecida: {series_id}. Disponíveis: {', '.join(series.SERIES)}")
+        versao = versoes['series'][series_id]
+        horizonte = _int_param(query, 'horizon', 90)
+        if not (Path(series.SERIES_DIR) / series_id / versao).exists():
+            await self._fit(('series', series_id, versao), _build_series, series_id, versoes['series_params'])
+
+        def montar():
+            resultados = series.load_results(series_id, versao)
+            df_futuro = resultados['future']
+            return {
+                'series': series_id,
+                'label': series.SERIES[series_id]['label'],
+                'version': versao,
+                'metrics': resultados['metrics']['metrics'],
+                'horizon_days': horizonte,
+                'forecast': _records(df_futuro[df_futuro['horizon_days'] <= horizonte]),
+            }
+
+        return await self._cached(('series', series_id, versao, horizonte), montar)
+
+    async def outliers(self, query):
+        no = (await self.versions())['grafo']['outliers']
+        desde = query.get('desde', [None])[0]
+        try:
+            desde = pd.Timestamp(desde) if desde else None
+        except ValueError:
+            raise HTTPError(400, "Parâmetro 'desde' deve ser uma data aaaa-mm-dd") from None
+
+        def montar():
+            _, df_outliers = no.value()
+            if desde is not None:
+                df_outliers = df_outliers[df_outliers['DATA'] >= desde]
+            return {
+                'version': no.key,
+                'outliers': _records(df_outliers.rename(columns={
+                    'DATA': 'date', 'Preço_Petróleo': 'price', 'Evento': 'event',
+                    'Evento_Descricao': 'event_description', 'Evento_Distancia_Dias': 'event_distance_days',
+                })),
+            }
+
+        return await self._cached(('outliers', no.key, desde), montar)
+
+    async def correlation(self, query):
+        grafo = (await self.versions())['grafo']
+        janela = _int_param(query, 'janela', pipeline.JANELA_MOVEL, permitidos={63, 126, 252, 504})
+        no_estatisticas = grafo['estatisticas']
+        # O grafo é compartilhado pelas requisições: o nó da janela pedida não é registrado nele.
+        no_movel = grafo.node('correlacao_movel', pipeline.rolling_stats, grafo['pareado'], janela=janela)
+
+        def montar():
+            estatisticas = {k: v for k, v in no_estatisticas.value().items() if k != 'ols_summary'}
+            df_movel = no_movel.value()
+            return {
+                'version': no_estatisticas.key,
+                'stats': estatisticas,
+                'rolling': {'janela': janela, **_records(df_movel.tail(1))[0]} if len(df_movel) else None,
+            }
+
+        return await self._cached(('correlation', no_estatisticas.key, no_movel.key), montar)
+
+    async def _route(self, path, query):
+        if path in self.routes:
+            return await self.routes[path](query)
+        if path.startswith('/series/'):
+            return await self.series(query, path[len('/series/'):])
+        raise HTTPError(404, f"Rota desconhecida: {path}")
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                mensagem = await receive()
+                if mensagem['type'] == 'lifespan.startup':
+                    await self.startup()
+                    await send({'type': 'lifespan.startup.complete'})
+                elif mensagem['type'] == 'lifespan.shutdown':
+                    await self.shutdown()
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+
+        if scope['method'] not in ('GET', 'HEAD'):
+            return await _send(send, 405, _erro("Método não permitido"), {'allow': 'GET, HEAD'})
+        try:
+            etag, corpo = await self._route(scope['path'].rstrip('/') or '/', parse_qs(scope['query_string'].decode()))
+        except HTTPError as e:
+            return await _send(send, e.status, _erro(str(e)))
+
+        headers = {'etag': etag, 'cache-control': 'no-cache'}
+        if etag in _if_none_match(scope['headers']):
+            return await _send(send, 304, b"", headers)
+        await _send(send, 200, b"" if scope['method'] == 'HEAD' else corpo, headers, tamanho=len(corpo))
+
+
+def _erro(mensagem):
+    return json.dumps({'error': mensagem}, ensure_ascii=False).encode()
+
+
+def _if_none_match(headers):
+    for nome, valor in headers:
+        if nome == b'if-none-match':
+            return {etag.strip().removeprefix('W/') for etag in valor.decode('latin-1').split(',')}
+    return set()
+
+
+async def _send(send, status, corpo, headers=None, tamanho=None):
+    cabecalhos = [(nome.encode(), valor.encode()) for nome, valor in (headers or {}).items()]
+    if status != 304:
+        cabecalhos.append((b'content-type', b'application/json; charset=utf-8'))
+        cabecalhos.append((b'content-length', str(len(corpo) if tamanho is None else tamanho).encode()))
+    await send({'type': 'http.response.start', 'status': status, 'headers': cabecalhos})
+    await send({'type': 'http.response.body', 'body': corpo})
+
+
+app = API()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="API JSON com a previsão, os outliers e a correlação")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1, help='processos para os ajustes do Prophet')
+    args = parser.parse_args()
+
+    uvicorn.run(API(max_workers=args.workers), host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""Artefatos pré-calculados da página de modelagem.
+
+O ``build`` executa uma vez a preparação dos dados, o ajuste, a previsão do
+período de teste e dos próximos dias, as métricas e a comparação com os
+outros modelos de ``forecasters``, e grava o resultado em
+``.cache/artifacts/<versão>/``. A versão depende do conteúdo do CSV, dos
+hiperparâmetros e das datas de corte, então a página só precisa calcular a
+versão esperada e ler os arquivos.
+
+    python -m petroleo.artifacts
+"""
+import argparse
+import hashlib
+import json
+from importlib import metadata
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from petroleo import CACHE_DIR, backtest, data, features, forecast, forecasters, model_store, tuning, write_text_atomic
+from petroleo.metrics import error_metrics
+
+ARTIFACTS_DIR = CACHE_DIR / "artifacts"
+FORMAT_VERSION = 4
+
+DEFAULT_SETTINGS = {
+    'inicio': '2019-11-25',
+    'fim': '2024-11-25',
+    'split_date': '2023-11-25',
+    'backtest_initial': '365 days',
+    'backtest_period': '90 days',
+    'backtest_horizon': '180 days',
+    'forecast_horizons': [30, 90, 180],
+    # Features de ``petroleo.features`` usadas como regressores do modelo principal.
+    'regressors': [],
+}
+BACKTEST_WINDOWS = ('expanding', 'rolling')
+COMPONENTES = ['trend', 'weekly', 'yearly', 'daily']
+MODELOS = ['naive', 'seasonal_naive', 'drift', 'ses', 'ets', 'arima', 'prophet', 'prophet_dolar']
+# Regressores do 'prophet_dolar' na comparação (no teste, a cotação realizada).
+REGRESSORES_COMPARACAO = ['Cotacao_Dolar']
+
+
+def artifact_version(data_version, params, settings=DEFAULT_SETTINGS):
+    chave = json.dumps({
+        'format': FORMAT_VERSION,
+        'data': data_version,
+        'params': params,
+        'settings': settings,
+        'prophet': metadata.version('prophet'),
+    }, sort_keys=True)
+    return hashlib.sha256(chave.encode()).hexdigest()[:16]
+
+
+def current_version(params=None, settings=DEFAULT_SETTINGS, path=data.PETROLEO_CSV):
+    params = params or tuning.load_best_params()
+    data_version = data.dataset_version(path, data.PETROLEO_COLUNA, 'Preço')
+    # Os regressores dependem também da série do dólar.
+    data_version += '-' + features.feature_version()
+    return artifact_version(data_version, params, settings), params
+
+
+def _cpu_seconds():
+    # Inclui os processos filhos já encerrados: o Prophet ajusta no cmdstan.
+    filhos = os.times()
+    return time.process_time() + filhos.children_user + filhos.children_system
+
+
+def compare_models(df_train, df_test, params, modelos=MODELOS):
+    """Ajusta cada modelo no treino e mede erro e tempo de CPU no teste.
+
+    Retorna (métricas por modelo, previsões de todos os modelos no teste).
+    """
+    linhas, previsoes = [], []
+    for nome in modelos:
+        if nome == 'prophet_dolar':
+            classe, kwargs = 'prophet', {'params': params, 'use_store': False, 'regressors': REGRESSORES_COMPARACAO}
+        else:
+            classe, kwargs = nome, ({'params': params, 'use_store': False} if nome == 'prophet' else {})
+        forecasters.FORECASTERS[classe].preload()
+        inicio = _cpu_seconds()
+        modelo = forecasters.make(classe, **kwargs).fit(df_train)
+        meio = _cpu_seconds()
+        previsao = modelo.predict(df_test)
+        fim = _cpu_seconds()
+        metricas = error_metrics(y_true=df_test['y'], y_pred=previsao['yhat'])
+        linhas.append({
+            'model': nome,
+            **{k: float(v) for k, v in metricas.items()},
+            'fit_cpu_s': meio - inicio,
+            'predict_cpu_s': fim - meio,
+        })
+        previsoes.append(previsao.assign(model=nome))
+    return pd.DataFrame(linhas), pd.concat(previsoes, ignore_index=True)
+
+
+def _prepare(path, settings, df_features=None, regressores=()):
+    df = data.load_petroleo(path).rename(columns={'DATA': 'ds', 'Preço': 'y'})
+    df = df[(df['ds'] >= settings['inicio']) & (df['ds'] <= settings['fim'])].reset_index(drop=True)
+    if regressores:
+        df = features.with_features(df, df_features, regressores)
+    df_train = df[df['ds'] <= settings['split_date']].copy()
+    df_test = df[df['ds'] > settings['split_date']].copy()
+    return df, df_train, df_test
+
+
+def build(params=None, settings=DEFAULT_SETTINGS, path=data.PETROLEO_CSV, artifacts_dir=ARTIFACTS_DIR, max_workers=None, force=False):
+    """Gera os artefatos da versão atual (se ainda não existirem) e retorna o diretório."""
+    version, params = current_version(params, settings, path)
+    destino = Path(artifacts_dir) / version
+    if destino.exists() and not force:
+        write_text_atomic(Path(artifacts_dir) / "LATEST", version)
+        return destino
+
+    regressores = list(settings.get('regressors', []))
+    df_features = features.load_features()
+    df, df_train, df_test = _prepare(path, settings, df_features, sorted(set(regressores) | set(REGRESSORES_COMPARACAO)))
+    model = model_store.fit_or_load(df_train[['ds', 'y', *regressores]], params, regressors=regressores)
+    df_test_fcst = model.predict(df_test[['ds', *regressores]])
+    metricas = error_metrics(y_true=df_test['y'], y_pred=df_test_fcst['yhat'])
+
+    # A previsão futura parte de um modelo ajustado em toda a janela; os
+    # horizontes menores são prefixos do maior, que é o único gravado. Os
+    # regressores ficam no último valor conhecido.
+    model_completo = model_store.fit_or_load(df[['ds', 'y', *regressores]], params, regressors=regressores)
+    horizontes = settings['forecast_horizons']
+    cenarios = {'base': features.hold_last(df_features, regressores)} if regressores else None
+    df_futuro = forecast.forecast(model_completo, horizontes, scenarios=cenarios)[max(horizontes)]
+
+    df_modelos, df_previsoes_modelos = compare_models(df_train, df_test, params)
+
+    backtests = []
+    for window in BACKTEST_WINDOWS:
+        folds = backtest.make_folds(
+            df['ds'],
+            initial=settings['backtest_initial'],
+            period=settings['backtest_period'],
+            horizon=settings['backtest_horizon'],
+            window=window,
+        )
+        df_cv = backtest.run_backtest(df, params, folds, max_workers=max_workers, regressors=regressores)
+        df_horizonte = backtest.metrics_by_horizon(df_cv)
+        df_horizonte.insert(0, 'window', window)
+        df_horizonte['cutoffs'] = len(folds)
+        backtests.append(df_horizonte)
+
+    Path(artifacts_dir).mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=artifacts_dir))
+    try:
+        pd.concat([df_train, df_test])[['ds', 'y']].to_parquet(tmp_dir / "history.parquet", index=False)
+        df_test_fcst[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].to_parquet(tmp_dir / "forecast.parquet", index=False)
+        df_futuro.drop(columns='scenario').to_parquet(tmp_dir / "future.parquet", index=False)
+        componentes = [c for c in COMPONENTES if c in df_test_fcst.columns]
+        df_test_fcst[['ds'] + componentes].to_parquet(tmp_dir / "components.parquet", index=False)
+        df_modelos.to_parquet(tmp_dir / "models.parquet", index=False)
+        df_previsoes_modelos.to_parquet(tmp_dir / "model_forecasts.parquet", index=False)
+        pd.concat(backtests, ignore_index=True).to_parquet(tmp_dir / "backtest.parquet", index=False)
+        with open(tmp_dir / "changepoints.json", "w") as f:
+            json.dump([cp.isoformat() for cp in model.changepoints], f)
+        with open(tmp_dir / "metrics.json", "w") as f:
+            json.dump({
+                'version': version,
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'params': params,
+                'settings': settings,
+                'metrics': {k: float(v) for k, v in metricas.items()},
+            }, f, indent=2)
+        if destino.exists():
+            shutil.rmtree(destino)
+        os.replace(tmp_dir, destino)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    write_text_atomic(Path(artifacts_dir) / "LATEST", version)
+    return destino
+
+
+def load(version, artifacts_dir=ARTIFACTS_DIR):
+    """Lê os artefatos de ``version``; levanta ``FileNotFoundError`` se não existirem."""
+    origem = Path(artifacts_dir) / version
+    with open(origem / "metrics.json") as f:
+        metricas = json.load(f)
+    with open(origem / "changepoints.json") as f:
+        changepoints = pd.to_datetime(json.load(f))
+    return {
+        'metrics': metricas,
+        'changepoints': changepoints,
+        'history': pd.read_parquet(origem / "history.parquet"),
+        'forecast': pd.read_parquet(origem / "forecast.parquet"),
+        'future': pd.read_parquet(origem / "future.parquet"),
+        'components': pd.read_parquet(origem / "components.parquet"),
+        'backtest': pd.read_parquet(origem / "backtest.parquet"),
+        'models': pd.read_parquet(origem / "models.parquet"),
+        'model_forecasts': pd.read_parquet(origem / "model_forecasts.parquet"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera os artefatos da página de modelagem")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='regera mesmo se a versão já existir')
+    args = parser.parse_args()
+
+    destino = build(max_workers=args.workers, force=args.force)
+    with open(destino / "metrics.json") as f:
+        print(json.dumps(json.load(f), indent=2, ensure_ascii=False))
+    print(f"Artefatos em {destino}")
+
+
+if __name__ == '__main__':
+    main()
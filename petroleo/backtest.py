@@ -0,0 +1,94 @@
+"""Backtesting com origem móvel para o modelo Prophet.
+
+Gera vários cortes treino/teste sobre a série, ajusta um Prophet por corte
+em paralelo (``ProcessPoolExecutor``) e agrega as métricas de erro por
+horizonte de previsão. Os workers recebem a série por ``petroleo.shared``
+(um caminho para arquivos mapeados em memória), não uma cópia serializada.
+"""
+import logging
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from petroleo import shared
+from petroleo.metrics import error_metrics
+
+Fold = namedtuple('Fold', ['train_start', 'cutoff', 'end'])
+
+
+def make_folds(ds, initial='365 days', period='90 days', horizon='90 days', window='expanding'):
+    """Lista os cortes entre o início da série + ``initial`` e o fim - ``horizon``.
+
+    Com ``window='expanding'`` todo corte treina desde o início da série; com
+    ``window='rolling'`` o treino tem sempre o tamanho de ``initial``.
+    """
+    if window not in ('expanding', 'rolling'):
+        raise ValueError(f"window deve ser 'expanding' ou 'rolling', não '{window}'")
+    initial, period, horizon = pd.Timedelta(initial), pd.Timedelta(period), pd.Timedelta(horizon)
+    ds = pd.to_datetime(pd.Series(ds))
+    inicio, fim = ds.min(), ds.max()
+
+    folds = []
+    cutoff = fim - horizon
+    while cutoff >= inicio + initial:
+        train_start = inicio if window == 'expanding' else cutoff - initial
+        folds.append(Fold(train_start, cutoff, cutoff + horizon))
+        cutoff -= period
+    return folds[::-1]
+
+
+def _fit_fold(df, params, fold, regressors=()):
+    from prophet import Prophet
+
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    if isinstance(df, str):
+        df = shared.attach_frame(df)
+
+    df_train = df[(df['ds'] >= fold.train_start) & (df['ds'] <= fold.cutoff)]
+    df_test = df[(df['ds'] > fold.cutoff) & (df['ds'] <= fold.end)]
+    model = Prophet(**{**params, 'uncertainty_samples': 0})
+    for nome in regressors:
+        model.add_regressor(nome)
+    model.fit(df_train)
+    fcst = model.predict(df_test[['ds', *regressors]])
+    return pd.DataFrame({
+        'cutoff': fold.cutoff,
+        'ds': df_test['ds'].to_numpy(),
+        'y': df_test['y'].to_numpy(),
+        'yhat': fcst['yhat'].to_numpy(),
+    })
+
+
+def run_backtest(df, params, folds, max_workers=None, regressors=()):
+    """Ajusta um modelo por corte e retorna as previsões fora da amostra.
+
+    ``regressors`` são colunas de ``df`` passadas ao ``add_regressor``; no
+    teste de cada corte são usados os valores realizados.
+    """
+    regressors = list(regressors)
+    handle = shared.publish_frame(df[['ds', 'y', *regressors]].reset_index(drop=True))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        resultados = list(executor.map(
+            _fit_fold, [handle] * len(folds), [params] * len(folds), folds, [regressors] * len(folds)
+        ))
+    df_cv = pd.concat(resultados, ignore_index=True)
+    df_cv['horizon'] = (df_cv['ds'] - df_cv['cutoff']).dt.days
+    return df_cv
+
+
+def metrics_by_horizon(df_cv, bucket_days=7):
+    """Agrega RMSE/MAE/MAPE por faixa de horizonte (em dias)."""
+    faixa = (np.ceil(df_cv['horizon'] / bucket_days) * bucket_days).astype(int)
+    linhas = []
+    for horizonte, grupo in df_cv.groupby(faixa):
+        linhas.append({'horizon': horizonte, **error_metrics(grupo['y'], grupo['yhat']), 'n': len(grupo)})
+    return pd.DataFrame(linhas)
+
+
+def metrics_by_cutoff(df_cv):
+    linhas = []
+    for cutoff, grupo in df_cv.groupby('cutoff'):
+        linhas.append({'cutoff': cutoff, **error_metrics(grupo['y'], grupo['yhat']), 'n': len(grupo)})
+    return pd.DataFrame(linhas)
@@ -0,0 +1,314 @@
+"""Figuras Plotly das páginas.
+
+As páginas só decidem o que exibir; a montagem das figuras fica aqui para
+poder ser reaproveitada fora do Streamlit (benchmarks e exportação em HTML).
+"""
+import plotly.express as px
+import plotly.graph_objects as go
+
+from petroleo import downsample
+
+
+def price_chart(df_grafico):
+    """Linha do preço do Brent da página principal."""
+    fig = px.line(
+        df_grafico,
+        x='DATA',
+        y='Preço',
+        labels={'DATA': '🗓️ Data', 'Preço': '💲 Preço em USD'},
+        template='simple_white',
+        color_discrete_sequence=['#FF69B4']
+    )
+
+    fig.update_layout(
+        title={
+            'text': '📈 Preço do Petróleo Brent',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 24}
+        },
+        xaxis_title='🗓️ Data',
+        yaxis_title='💲 Preço em USD',
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=False),
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=600,
+        margin=dict(l=50, r=50, t=100, b=50)
+    )
+    return fig
+
+
+def oil_vs_dollar_chart(df_grafico_petroleo, df_grafico_dolar):
+    """Brent e dólar no mesmo gráfico, com o dólar no eixo da direita."""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=df_grafico_petroleo['DATA'],
+        y=df_grafico_petroleo['Preço_Petróleo'],
+        mode='lines',
+        name='Preço do Petróleo Brent (USD)',
+        line=dict(color='#FF69B4')
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=df_grafico_dolar['DATA'],
+        y=df_grafico_dolar['Cotacao_Dolar'],
+        mode='lines',
+        name='Cotação do Dólar (BRL)',
+        line=dict(color='#6495ED'),
+        yaxis='y2'
+    ))
+
+    fig.update_layout(
+        title={
+            'text': '📈 Preço do Petróleo Brent vs. Cotação do Dólar',
+            'y': 0.95,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top'
+        },
+        xaxis_title='🗓️ Data',
+        yaxis_title='💲 Preço do Petróleo Brent (USD)',
+        yaxis=dict(title='💲 Preço do Petróleo Brent (USD)', showgrid=False),
+        yaxis2=dict(
+            title='💱 Cotação do Dólar (BRL)',
+            overlaying='y',
+            side='right',
+            showgrid=False
+        ),
+        legend=dict(x=0.01, y=0.99),
+        height=600,
+        margin=dict(l=50, r=50, t=100, b=50),
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+def regression_chart(df_combinado, estatisticas):
+    """Dispersão petróleo x dólar com a reta OLS de ``stats.relationship_stats``."""
+    fig = px.scatter(
+        df_combinado,
+        x='Preço_Petróleo',
+        y='Cotacao_Dolar',
+        labels={
+            'Preço_Petróleo': '💲 Preço do Petróleo Brent (USD)',
+            'Cotacao_Dolar': '💱 Cotação do Dólar (BRL)'
+        },
+        title='📈 Relação entre o Preço do Petróleo Brent e a Cotação do Dólar'
+    )
+
+    x_reta = [df_combinado['Preço_Petróleo'].min(), df_combinado['Preço_Petróleo'].max()]
+    fig.add_trace(go.Scatter(
+        x=x_reta,
+        y=[estatisticas['intercept'] + estatisticas['slope'] * x for x in x_reta],
+        mode='lines',
+        name='OLS',
+        showlegend=False
+    ))
+    return fig
+
+
+def rolling_relationship_chart(df_movel):
+    """Pearson, Spearman e beta móveis."""
+    fig = go.Figure()
+    for coluna, cor in [('Pearson', '#FF69B4'), ('Spearman', '#6495ED')]:
+        df_grafico_movel = downsample.downsample(df_movel, 'DATA', coluna)
+        fig.add_trace(go.Scatter(
+            x=df_grafico_movel['DATA'],
+            y=df_grafico_movel[coluna],
+            mode='lines',
+            name=coluna,
+            line=dict(color=cor)
+        ))
+    df_grafico_beta = downsample.downsample(df_movel, 'DATA', 'Beta')
+    fig.add_trace(go.Scatter(
+        x=df_grafico_beta['DATA'],
+        y=df_grafico_beta['Beta'],
+        mode='lines',
+        name='Beta (BRL por USD do barril)',
+        line=dict(color='gray', dash='dot'),
+        yaxis='y2'
+    ))
+    fig.update_layout(
+        xaxis_title='🗓️ Data',
+        yaxis=dict(title='📏 Correlação', range=[-1, 1], showgrid=False),
+        yaxis2=dict(title='📐 Beta', overlaying='y', side='right', showgrid=False),
+        legend=dict(x=0.01, y=0.99),
+        height=500,
+        margin=dict(l=50, r=50, t=50, b=50),
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+def outlier_chart(normais_petroleo, outliers_petroleo):
+    """Série do Brent com os outliers destacados e o evento associado no hover."""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=normais_petroleo['DATA'],
+        y=normais_petroleo['Preço_Petróleo'],
+        mode='lines',
+        name='Normal',
+        line=dict(color='lightgray'),
+        showlegend=False
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=outliers_petroleo['DATA'],
+        y=outliers_petroleo['Preço_Petróleo'],
+        mode='markers',
+        name='Outlier',
+        marker=dict(color='red', size=10, symbol='circle'),
+        text=outliers_petroleo['Evento_Descricao'],
+        hoverinfo='text',
+        showlegend=True
+    ))
+
+    fig.update_layout(
+        xaxis_title='🗓️ Data',
+        yaxis_title='💲 Preço do Petróleo Brent (USD)',
+        hovermode='closest',
+        height=600,
+        margin=dict(l=50, r=50, t=80, b=50),
+        plot_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig
+
+
+def forecast_chart(df_real, previsao, changepoints, titulo='📈 Previsão do Preço do Petróleo Bruto Brent (FOB)', yaxis_title='💲 Preço (USD)'):
+    """Valores reais, previsão com intervalo de confiança e changepoints."""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=df_real['ds'],
+        y=df_real['y'],
+        mode='lines',
+        name='Valores Reais',
+        line=dict(color='#6495ED')
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=previsao['ds'],
+        y=previsao['yhat'],
+        mode='lines',
+        name='Previsões',
+        line=dict(color='#FF69B4')
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=previsao['ds'],
+        y=previsao['yhat_upper'],
+        mode='lines',
+        name='Intervalo de Confiança Superior',
+        line=dict(color='#FF69B4', width=0),
+        showlegend=False
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=previsao['ds'],
+        y=previsao['yhat_lower'],
+        mode='lines',
+        name='Intervalo de Confiança Inferior',
+        line=dict(color='#FF69B4', width=0),
+        fill='tonexty',
+        fillcolor='rgba(255,105,180,0.2)',
+        showlegend=False
+    ))
+
+    for cp in changepoints:
+        fig.add_vline(x=cp, line=dict(color='black', dash='dash'), opacity=0.5)
+
+    fig.update_layout(
+        title={
+            'text': titulo,
+            'y':0.95,
+            'x':0.5,
+            'xanchor': 'center',
+            'yanchor': 'top',
+            'font': {'size': 24}
+        },
+        xaxis_title='🗓️ Data',
+        yaxis_title=yaxis_title,
+        legend=dict(x=0.01, y=0.99),
+        template='plotly_white',
+        height=600
+    )
+    return fig
+
+
+def future_chart(df_recente, df_futuro, titulo='🔮 Previsão para os Próximos Dias', yaxis_title='💲 Preço (USD)'):
+    """Últimos valores reais seguidos da previsão futura com intervalo de confiança."""
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=df_recente['ds'],
+        y=df_recente['y'],
+        mode='lines',
+        name='Valores Reais',
+        line=dict(color='#6495ED')
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=df_futuro['ds'],
+        y=df_futuro['yhat_upper'],
+        mode='lines',
+        line=dict(color='#FF69B4', width=0),
+        showlegend=False
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=df_futuro['ds'],
+        y=df_futuro['yhat_lower'],
+        mode='lines',
+        name='Intervalo de Confiança',
+        line=dict(color='#FF69B4', width=0),
+        fill='tonexty',
+        fillcolor='rgba(255,105,180,0.2)'
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=df_futuro['ds'],
+        y=df_futuro['yhat'],
+        mode='lines',
+        name='Previsão',
+        line=dict(color='#FF69B4')
+    ))
+
+    fig.update_layout(
+        title=titulo,
+        xaxis_title='🗓️ Data',
+        yaxis_title=yaxis_title,
+        legend=dict(x=0.01, y=0.99),
+        template='plotly_white',
+        height=500
+    )
+    return fig
+
+
+def backtest_chart(df_metricas_horizonte):
+    """MAPE por horizonte do backtesting."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df_metricas_horizonte['horizon'], y=df_metricas_horizonte['mape'], mode='lines+markers', name='MAPE (%)', line=dict(color='#FF69B4')))
+    fig.update_layout(
+        title=f'📏 MAPE por Horizonte ({df_metricas_horizonte["cutoffs"].iloc[0]} cortes)',
+        xaxis_title='⏱️ Horizonte (dias)',
+        yaxis_title='MAPE (%)',
+        template='plotly_white',
+        height=400
+    )
+    return fig
+
+
+def component_chart(df_componentes, coluna, titulo, yaxis_title):
+    """Um componente (tendência ou sazonalidade) da decomposição do Prophet."""
+    fig = px.line(df_componentes, x='ds', y=coluna, title=titulo)
+    fig.update_layout(
+        xaxis_title='🗓️ Data',
+        yaxis_title=yaxis_title,
+        template='plotly_white',
+        height=400
+    )
+    return fig
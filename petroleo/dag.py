@@ -0,0 +1,221 @@
+"""Cache endereçado por conteúdo para as etapas da análise.
+
+As etapas formam um grafo (leitura → alinhamento → estatísticas, outliers,
+...). A chave de cada nó é o hash do nome da etapa, da função, dos
+parâmetros e das chaves dos nós de entrada; a dos nós de origem é a versão
+do conteúdo dos dados (``data.dataset_version``), não o caminho do arquivo.
+Uma linha nova no CSV do dólar muda só a chave do nó do dólar e, em cascata,
+as dos nós que dependem dele; os demais continuam vindo do cache.
+
+    grafo = dag.Graph(namespace='analise-1')
+    petroleo = grafo.source('petroleo', versao_petroleo, data.load_petroleo)
+    dolar = grafo.source('dolar', versao_dolar, data.load_dolar)
+    alinhado = grafo.stage('alinhamento', align.align, petroleo, dolar, calendar='union')
+    df = alinhado.value()
+
+Os nós são preguiçosos: ``value()`` só calcula (e só pede os valores das
+entradas) quando a chave não está no cache. Os valores ficam em dois níveis:
+um LRU em memória com no máximo ``max_items`` valores e um diretório em disco
+(``.cache/dag/<chave>.pkl``, compartilhado entre processos) com no máximo
+``max_bytes``, do qual saem primeiro os arquivos usados há mais tempo.
+
+A chave não inclui o código das funções: ao mudar o que uma etapa calcula,
+mude o ``namespace`` do grafo. Os valores devolvidos são compartilhados
+com o cache e não devem ser modificados.
+"""
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from petroleo import CACHE_DIR
+
+DAG_DIR = CACHE_DIR / "dag"
+MAX_ITEMS = int(os.environ.get("PETROLEO_DAG_MAX_ITEMS", 64))
+MAX_BYTES = int(float(os.environ.get("PETROLEO_DAG_MAX_MB", 256)) * 1024 * 1024)
+
+
+class Cache:
+    """LRU em memória sobre um diretório em disco com tamanho máximo."""
+
+    def __init__(self, cache_dir=DAG_DIR, max_items=MAX_ITEMS, max_bytes=MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key, persist=True):
+        """``(True, valor)`` se ``key`` está no cache; ``(False, None)`` caso contrário."""
+        with self._lock:
+            if key in self._memoria:
+                self._memoria.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return True, self._memoria[key]
+        if persist:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    valor = pickle.load(f)
+            except FileNotFoundError:
+                pass
+            else:
+                # A remoção por tamanho segue o mtime: marca o arquivo como usado.
+                try:
+                    os.utime(path)
+                except FileNotFoundError:
+                    pass
+                self._remember(key, valor)
+                with self._lock:
+                    self.stats['disk_hits'] += 1
+                return True, valor
+        with self._lock:
+            self.stats['misses'] += 1
+        return False, None
+
+    def put(self, key, valor, persist=True):
+        self._remember(key, valor)
+        if not persist or self.max_bytes <= 0:
+            return
+        conteudo = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(conteudo) > self.max_bytes:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(conteudo)
+        os.replace(tmp_path, path)
+        self._trim()
+
+    def _remember(self, key, valor):
+        if self.max_items <= 0:
+            return
+        with self._lock:
+            self._memoria[key] = valor
+            self._memoria.move_to_end(key)
+            while len(self._memoria) > self.max_items:
+                self._memoria.popitem(last=False)
+
+    def _trim(self):
+        """Remove os arquivos usados há mais tempo até o diretório caber em ``max_bytes``."""
+        arquivos = []
+        with os.scandir(self.cache_dir) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(".pkl"):
+                    try:
+                        stat = entrada.stat()
+                    except FileNotFoundError:
+                        continue
+                    arquivos.append((stat.st_mtime_ns, stat.st_size, entrada.path))
+        total = sum(tamanho for _, tamanho, _ in arquivos)
+        for _, tamanho, path in sorted(arquivos):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= tamanho
+
+    def disk_usage(self):
+        if not self.cache_dir.exists():
+            return 0
+        return sum(path.stat().st_size for path in self.cache_dir.glob("*.pkl"))
+
+    def clear(self):
+        with self._lock:
+            self._memoria.clear()
+        for path in self.cache_dir.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Cache compartilhado pelo processo (páginas e pipeline usam o mesmo LRU)."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = Cache()
+        return _default_cache
+
+
+def _hash(chave):
+    return hashlib.sha256(json.dumps(chave, sort_keys=True).encode()).hexdigest()[:24]
+
+
+class Node:
+    """Resultado de uma etapa, identificado pela chave e calculado sob demanda."""
+
+    def __init__(self, graph, name, key, compute, persist=True):
+        self.graph = graph
+        self.name = name
+        self.key = key
+        self._compute = compute
+        self.persist = persist
+
+    def value(self):
+        encontrado, valor = self.graph.cache.get(self.key, self.persist)
+        if not encontrado:
+            valor = self._compute()
+            self.graph.cache.put(self.key, valor, self.persist)
+        return valor
+
+    def __repr__(self):
+        return f"Node({self.name!r}, {self.key})"
+
+
+class Graph:
+    """Registro dos nós; ``graph[nome]`` devolve o último nó com esse nome."""
+
+    def __init__(self, cache=None, namespace=''):
+        self.cache = cache or default_cache()
+        self.namespace = namespace
+        self.nodes = {}
+
+    def source(self, name, version, load):
+        """Dados de entrada com versão de conteúdo ``version``; ficam só na memória.
+
+        ``load`` já lê de um cache próprio (as partições Parquet de ``data``),
+        então gravar o resultado de novo no disco só duplicaria os dados.
+        """
+        key = _hash({'namespace': self.namespace, 'source': name, 'version': version})
+        node = Node(self, name, key, load, persist=False)
+        self.nodes[name] = node
+        return node
+
+    def node(self, name, fn, *deps, **params):
+        """Nó ``fn(*valores das entradas, **params)``, sem registrá-lo em ``graph[name]``.
+
+        Tem a mesma chave (e o mesmo valor em cache) que ``stage`` com os
+        mesmos argumentos; serve para variações pedidas por uma requisição
+        sobre um grafo compartilhado entre threads. ``params`` precisam ser
+        serializáveis em JSON.
+        """
+        key = _hash({
+            'namespace': self.namespace,
+            'stage': name,
+            'fn': f"{fn.__module__}.{fn.__qualname__}",
+            'deps': [dep.key for dep in deps],
+            'params': params,
+        })
+        return Node(self, name, key, lambda: fn(*(dep.value() for dep in deps), **params))
+
+    def stage(self, name, fn, *deps, **params):
+        """``node`` registrado como ``graph[name]``."""
+        node = self.node(name, fn, *deps, **params)
+        self.nodes[name] = node
+        return node
+
+    def __getitem__(self, name):
+        return self.nodes[name]
@@ -0,0 +1,250 @@
+"""Camada de dados das séries do IPEA.
+
+Os CSVs exportados pelo ipeadata (Windows-1252, separados por ``;``) são
+convertidos uma única vez para Parquet com colunas tipadas (``DATA`` em
+datetime64 e o valor em float64). O cache é invalidado quando o arquivo de
+origem muda: primeiro pelo ``mtime``/tamanho e, se estes divergirem, pelo
+hash do conteúdo. Quando o CSV apenas ganhou linhas novas, elas são
+gravadas como uma partição adicional em vez de reconstruir o cache.
+"""
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from petroleo import CACHE_DIR, write_text_atomic
+
+DATA_DIR = CACHE_DIR / "data"
+MAX_PARTS = 32
+
+#http://www.ipeadata.gov.br/ExibeSerie.aspx?module=m&serid=1650971490&oper=view
+PETROLEO_CSV = 'tabela_dxgvTable.csv'
+PETROLEO_COLUNA = 'Preço - petróleo bruto - Brent (FOB)'
+
+#http://www.ipeadata.gov.br/ExibeSerie.aspx?serid=38590&module=M
+DOLAR_CSV = 'tabela_dxgvTable_dolar.csv'
+DOLAR_COLUNA = 'Taxa de câmbio - R$ / US$ - comercial - compra - média'
+
+
+IPEA_FORMATO_DATA = '%d/%m/%Y'
+
+
+def parse_ipea_dates(valores):
+    """Converte datas ``dd/mm/YYYY`` para datetime64 direto sobre os bytes.
+
+    As datas do ipeadata têm largura fixa, então dia, mês e ano saem por
+    aritmética vetorizada nos dígitos. Qualquer valor fora desse padrão (ou
+    uma data inválida como 31/02) cai no ``pd.to_datetime`` com formato
+    explícito, que produz a mensagem de erro usual.
+    """
+    brutos = np.asarray(valores, dtype='S11').view(np.uint8).reshape(-1, 11)
+    digitos = brutos[:, [0, 1, 3, 4, 6, 7, 8, 9]].astype(np.int64) - ord('0')
+    valido = (
+        (brutos[:, 10] == 0)
+        & (brutos[:, 2] == ord('/'))
+        & (brutos[:, 5] == ord('/'))
+        & ((digitos >= 0) & (digitos <= 9)).all(axis=1)
+    )
+    if valido.all():
+        dia = digitos[:, 0] * 10 + digitos[:, 1]
+        mes = digitos[:, 2] * 10 + digitos[:, 3]
+        ano = digitos[:, 4] * 1000 + digitos[:, 5] * 100 + digitos[:, 6] * 10 + digitos[:, 7]
+        inicio_mes = ((ano - 1970) * 12 + (mes - 1)).astype('datetime64[M]')
+        datas = inicio_mes.astype('datetime64[D]') + (dia - 1)
+        if ((dia >= 1) & (mes >= 1) & (mes <= 12) & (datas.astype('datetime64[M]') == inicio_mes)).all():
+            return pd.DatetimeIndex(datas.astype('datetime64[us]'))
+    return pd.DatetimeIndex(pd.to_datetime(valores, format=IPEA_FORMATO_DATA))
+
+
+def parse_ipea_csv(path, coluna, nome):
+    """Lê um CSV do ipeadata com datas ``dd/mm/YYYY`` e decimais com vírgula.
+
+    A conversão dos números fica com o parser C do pandas (``decimal=","``) e
+    as datas com ``parse_ipea_dates``, evitando ``str.replace`` e a inferência
+    elemento a elemento do ``dayfirst``. ``path`` também pode ser o conteúdo
+    do CSV em bytes.
+    """
+    abrir = (lambda: io.BytesIO(path)) if isinstance(path, bytes) else (lambda: path)
+    header = pd.read_csv(abrir(), encoding="windows-1252", sep=";", nrows=0).columns
+    if coluna not in header:
+        raise ValueError(f"A coluna '{coluna}' não foi encontrada no arquivo '{path}'. As colunas disponíveis são: {header.tolist()}")
+    df = pd.read_csv(
+        abrir(),
+        encoding="windows-1252",
+        sep=";",
+        decimal=",",
+        usecols=['DATA', coluna],
+        dtype={'DATA': str, coluna: 'float64'},
+    )
+    df = df.dropna()
+    df = pd.DataFrame({
+        'DATA': parse_ipea_dates(df['DATA'].to_numpy()),
+        nome: df[coluna].to_numpy(),
+    })
+    df = df.sort_values('DATA').reset_index(drop=True)
+    return df
+
+
+def _store_paths(path, nome, cache_dir):
+    store_dir = Path(cache_dir) / f"{Path(path).stem}-{nome}"
+    return store_dir, store_dir / "meta.json"
+
+
+def _source_stat(path):
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    write_text_atomic(meta_path, json.dumps(meta))
+
+
+def _sha256(conteudo):
+    return hashlib.sha256(conteudo).hexdigest()
+
+
+def _write_part(store_dir, numero, df):
+    part_path = store_dir / f"part-{numero:05d}.parquet"
+    tmp_path = part_path.with_name(f"{part_path.name}.{os.getpid()}.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, part_path)
+
+
+def _content_meta(conteudo):
+    header_size = conteudo.index(b"\n") + 1
+    return {
+        'sha256': _sha256(conteudo),
+        'header_sha256': _sha256(conteudo[:header_size]),
+        'body_sha256': _sha256(conteudo[header_size:]),
+        'header_size': header_size,
+    }
+
+
+def _new_rows(conteudo, meta):
+    """Isola as linhas acrescentadas desde o último cache, se for só isso que mudou.
+
+    O ipeadata exporta em ordem decrescente de data, então as linhas novas
+    entram logo após o cabeçalho; se o arquivo estiver em ordem crescente,
+    elas entram no final. Retorna ``None`` quando o conteúdo antigo não está
+    intacto no arquivo novo.
+    """
+    antigo = meta['size']
+    header_size = meta['header_size']
+    if len(conteudo) <= antigo:
+        return None
+    if conteudo[antigo - 1:antigo] == b"\n" and _sha256(conteudo[:antigo]) == meta['sha256']:
+        return conteudo[:header_size] + conteudo[antigo:]
+    inicio_corpo = len(conteudo) - (antigo - header_size)
+    if (
+        _sha256(conteudo[:header_size]) == meta['header_sha256']
+        and conteudo[inicio_corpo - 1:inicio_corpo] == b"\n"
+        and _sha256(conteudo[inicio_corpo:]) == meta['body_sha256']
+    ):
+        return conteudo[:inicio_corpo]
+    return None
+
+
+def _append(store_dir, meta_path, meta, conteudo, novas, coluna, nome, stat):
+    """Acrescenta ``novas`` linhas ao cache como uma nova partição Parquet.
+
+    Retorna ``None`` (e nada é gravado) se alguma linha nova não for
+    posterior à última data do cache, caso em que o chamador reconstrói tudo.
+    """
+    df_novo = parse_ipea_csv(novas, coluna, nome)
+    if meta['last_date'] is not None and len(df_novo) and df_novo['DATA'].min() <= pd.Timestamp(meta['last_date']):
+        return None
+    if meta['parts'] >= MAX_PARTS:
+        df_novo = pd.concat([_read_parts(store_dir), df_novo], ignore_index=True)
+        return _rebuild_from_frame(store_dir, meta_path, df_novo, conteudo, coluna, stat)
+    if len(df_novo):
+        _write_part(store_dir, meta['parts'], df_novo)
+    meta = {
+        **meta,
+        'rows': meta['rows'] + len(df_novo),
+        'parts': meta['parts'] + (1 if len(df_novo) else 0),
+        'last_date': df_novo['DATA'].max().isoformat() if len(df_novo) else meta['last_date'],
+        **_content_meta(conteudo),
+        **stat,
+    }
+    _write_meta(meta_path, meta)
+    return meta
+
+
+def _rebuild_from_frame(store_dir, meta_path, df, conteudo, coluna, stat):
+    store_dir.mkdir(parents=True, exist_ok=True)
+    for part_path in store_dir.glob("part-*.parquet"):
+        part_path.unlink()
+    _write_part(store_dir, 0, df)
+    meta = {
+        'coluna': coluna,
+        'rows': len(df),
+        'parts': 1,
+        'last_date': df['DATA'].max().isoformat() if len(df) else None,
+        **_content_meta(conteudo),
+        **stat,
+    }
+    _write_meta(meta_path, meta)
+    return meta
+
+
+def _read_parts(store_dir):
+    partes = sorted(store_dir.glob("part-*.parquet"))
+    return pd.concat([pd.read_parquet(part_path) for part_path in partes], ignore_index=True)
+
+
+def dataset_version(path, coluna, nome, cache_dir=DATA_DIR):
+    """Garante que o cache está atualizado e retorna o hash do CSV de origem.
+
+    Se o CSV só ganhou linhas novas desde a última leitura, apenas essas
+    linhas são convertidas e gravadas como uma partição adicional; qualquer
+    outra alteração reconstrói o cache.
+    """
+    store_dir, meta_path = _store_paths(path, nome, cache_dir)
+    stat = _source_stat(path)
+    meta = _read_meta(meta_path)
+
+    valido = meta is not None and meta.get('coluna') == coluna and meta.get('parts', 0) > 0
+    if valido and meta['mtime_ns'] == stat['mtime_ns'] and meta['size'] == stat['size']:
+        return meta['sha256']
+
+    with open(path, "rb") as f:
+        conteudo = f.read()
+
+    if valido:
+        if _sha256(conteudo) == meta['sha256']:
+            _write_meta(meta_path, {**meta, **stat})
+            return meta['sha256']
+        novas = _new_rows(conteudo, meta)
+        if novas is not None:
+            meta_novo = _append(store_dir, meta_path, meta, conteudo, novas, coluna, nome, stat)
+            if meta_novo is not None:
+                return meta_novo['sha256']
+
+    df = parse_ipea_csv(conteudo, coluna, nome)
+    return _rebuild_from_frame(store_dir, meta_path, df, conteudo, coluna, stat)['sha256']
+
+
+def load_series(path, coluna, nome, cache_dir=DATA_DIR):
+    dataset_version(path, coluna, nome, cache_dir)
+    store_dir, _ = _store_paths(path, nome, cache_dir)
+    return _read_parts(store_dir)
+
+
+def load_petroleo(path=PETROLEO_CSV, cache_dir=DATA_DIR):
+    return load_series(path, PETROLEO_COLUNA, 'Preço', cache_dir)
+
+
+def load_dolar(path=DOLAR_CSV, coluna=DOLAR_COLUNA, cache_dir=DATA_DIR):
+    return load_series(path, coluna, 'Cotacao_Dolar', cache_dir)
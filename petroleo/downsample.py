@@ -0,0 +1,76 @@
+"""Redução de pontos das séries longas antes de enviá-las ao Plotly.
+
+Uma linha com ~11 mil pontos não tem mais detalhe visível do que a largura
+do gráfico em pixels. ``downsample`` reduz cada série a um orçamento de
+pontos (LTTB ou min/max por faixa) e sempre mantém o máximo e o mínimo
+globais, para que o gráfico continue batendo com os cards de valor máximo e
+mínimo do período.
+"""
+import numpy as np
+
+PONTOS_GRAFICO = 2000
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def lttb_indices(x, y, n_out):
+    """Índices escolhidos pelo Largest-Triangle-Three-Buckets (Steinarsson, 2013)."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x, y = _as_float(x), np.asarray(y, dtype=np.float64)
+
+    bordas = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    anterior = 0
+    for i in range(n_out - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        if i + 2 < len(bordas):
+            prox_inicio, prox_fim = bordas[i + 1], bordas[i + 2]
+            media_x, media_y = x[prox_inicio:prox_fim].mean(), y[prox_inicio:prox_fim].mean()
+        else:
+            media_x, media_y = x[-1], y[-1]
+        ax, ay = x[anterior], y[anterior]
+        areas = np.abs((ax - media_x) * (y[inicio:fim] - ay) - (ax - x[inicio:fim]) * (media_y - ay))
+        anterior = inicio + int(np.argmax(areas))
+        indices[i + 1] = anterior
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """Índices do mínimo e do máximo de cada uma das ``n_out // 2`` faixas."""
+    n = len(y)
+    n_faixas = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    bordas = np.linspace(0, n, n_faixas + 1).astype(np.int64)
+    faixa = np.repeat(np.arange(n_faixas), np.diff(bordas))
+    ordem = np.lexsort((y, faixa))
+    return np.unique(np.concatenate([ordem[bordas[:-1]], ordem[bordas[1:] - 1]]))
+
+
+def downsample(df, x, y, n_out=PONTOS_GRAFICO, method='minmax'):
+    """Subconjunto de ``df`` com até ~``n_out`` linhas para plotar ``y`` contra ``x``.
+
+    ``df`` deve estar ordenado por ``x``; com ``x=None`` o índice é usado como
+    eixo. O máximo e o mínimo de ``y`` são sempre preservados.
+    """
+    if len(df) <= n_out:
+        return df
+    valores = df[y].to_numpy()
+    if method == 'lttb':
+        eixo = df.index.to_numpy() if x is None else df[x].to_numpy()
+        indices = lttb_indices(eixo, valores, n_out)
+    elif method == 'minmax':
+        indices = minmax_indices(valores, n_out)
+    else:
+        raise ValueError(f"method deve ser 'lttb' ou 'minmax', não '{method}'")
+    extremos = [int(np.nanargmax(valores)), int(np.nanargmin(valores))]
+    return df.iloc[np.union1d(indices, extremos)]
@@ -0,0 +1,99 @@
+"""Catálogo de eventos do mercado de petróleo e anotação dos outliers.
+
+Os eventos ficam em ``eventos_petroleo.json`` (com um campo ``version``),
+cada um como uma janela ``[inicio, fim]`` de datas inclusivas. Como as
+janelas não se sobrepõem, ordenadas pelo início elas formam um índice de
+intervalos: para cada data basta um ``np.searchsorted`` nos inícios para
+achar a janela que a contém ou, se nenhuma contém, a anterior e a seguinte,
+das quais fica a mais próxima (até ``max_distance``). Anotar ``k`` outliers
+num catálogo de ``m`` eventos custa O(k log m), sem ``merge`` por data exata.
+
+    catalogo = events.load_catalog()
+    df_anotado = events.annotate(outliers_petroleo, catalogo)
+"""
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+EVENTOS_JSON = 'eventos_petroleo.json'
+SEM_EVENTO = "🔍 Sem Evento Identificado"
+MAX_DISTANCE = '60D'
+
+
+def catalog_version(path=EVENTOS_JSON):
+    """Versão declarada no arquivo + hash do conteúdo (muda a cada edição do catálogo)."""
+    with open(path, "rb") as f:
+        conteudo = f.read()
+    return f"v{json.loads(conteudo)['version']}-{hashlib.sha256(conteudo).hexdigest()[:12]}"
+
+
+def load_catalog(path=EVENTOS_JSON):
+    """Eventos ordenados por ``inicio``, com ``inicio``, ``fim``, ``titulo`` e ``descricao``."""
+    with open(path, encoding="utf-8") as f:
+        eventos = json.load(f)['eventos']
+    catalogo = pd.DataFrame(eventos, columns=['inicio', 'fim', 'titulo', 'descricao'])
+    catalogo['inicio'] = pd.to_datetime(catalogo['inicio'])
+    catalogo['fim'] = pd.to_datetime(catalogo['fim'])
+    catalogo = catalogo.sort_values('inicio', ignore_index=True)
+
+    invertidos = catalogo['titulo'][catalogo['fim'] < catalogo['inicio']]
+    if len(invertidos):
+        raise ValueError(f"{path}: eventos com fim antes do início: {list(invertidos)}")
+    sobrepostos = np.flatnonzero(catalogo['inicio'].to_numpy()[1:] <= catalogo['fim'].to_numpy()[:-1])
+    if len(sobrepostos):
+        pares = [f"{catalogo['titulo'][i]} / {catalogo['titulo'][i + 1]}" for i in sobrepostos]
+        raise ValueError(f"{path}: janelas de eventos sobrepostas: {pares}")
+    return catalogo
+
+
+def match(datas, catalogo, max_distance=MAX_DISTANCE):
+    """Evento de cada data: ``(indice, distancia_dias)``.
+
+    ``indice`` é a linha de ``catalogo`` cuja janela contém a data ou, se
+    nenhuma contém, a da janela mais próxima a no máximo ``max_distance``;
+    ``-1`` quando não há evento. ``distancia_dias`` é 0 dentro da janela e
+    NaN sem evento.
+    """
+    datas = pd.to_datetime(pd.Series(datas)).to_numpy('datetime64[ns]').astype(np.int64)
+    inicios = catalogo['inicio'].to_numpy('datetime64[ns]').astype(np.int64)
+    fins = catalogo['fim'].to_numpy('datetime64[ns]').astype(np.int64)
+    limite = pd.Timedelta(max_distance).value
+    m = len(inicios)
+    if m == 0:
+        return np.full(len(datas), -1), np.full(len(datas), np.nan)
+
+    # Última janela que começa até a data (-1 se a data é anterior a todas).
+    anterior = np.searchsorted(inicios, datas, side='right') - 1
+    seguinte = anterior + 1
+    tem_anterior = anterior >= 0
+    tem_seguinte = seguinte < m
+
+    dist_anterior = np.where(tem_anterior, datas - fins[np.clip(anterior, 0, m - 1)], np.iinfo(np.int64).max)
+    dist_seguinte = np.where(tem_seguinte, inicios[np.clip(seguinte, 0, m - 1)] - datas, np.iinfo(np.int64).max)
+    # Dentro da janela anterior a distância até o fim é <= 0.
+    dist_anterior = np.maximum(dist_anterior, 0)
+
+    usar_seguinte = dist_seguinte < dist_anterior
+    distancia = np.where(usar_seguinte, dist_seguinte, dist_anterior)
+    indice = np.where(usar_seguinte, seguinte, anterior)
+    encontrado = distancia <= limite
+
+    indice = np.where(encontrado, indice, -1)
+    distancia_dias = np.where(encontrado, distancia / pd.Timedelta('1D').value, np.nan)
+    return indice, distancia_dias
+
+
+def annotate(df, catalogo, coluna='DATA', max_distance=MAX_DISTANCE):
+    """Cópia de ``df`` com ``Evento``, ``Evento_Descricao`` e ``Evento_Distancia_Dias``."""
+    indice, distancia_dias = match(df[coluna], catalogo, max_distance)
+    # O índice -1 (sem evento) cai no valor acrescentado ao final.
+    titulos = np.append(catalogo['titulo'].to_numpy(dtype=object), None)
+    descricoes = np.append(catalogo['descricao'].to_numpy(dtype=object), SEM_EVENTO)
+
+    df = df.copy()
+    df['Evento'] = titulos[indice]
+    df['Evento_Descricao'] = descricoes[indice]
+    df['Evento_Distancia_Dias'] = distancia_dias
+    return df
@@ -0,0 +1,130 @@
+"""Features da cotação do dólar para usar como regressores do Prophet.
+
+A cotação é alinhada ao calendário do Brent (último valor até 3 dias antes,
+como em ``align``, e a última cotação conhecida nos buracos maiores) e, em
+uma única passada vetorizada, são calculadas as defasagens e as
+médias/desvios móveis. O resultado fica em
+``.cache/features/<versão>.parquet``; a versão depende das duas séries e das
+defasagens/janelas pedidas, então as features só são recalculadas quando
+chegam dados novos.
+
+    df_features = features.load_features()
+    df_train = features.with_features(df_train, df_features, ['Cotacao_Dolar_media21'])
+    model = model_store.fit_or_load(df_train, params, regressors=['Cotacao_Dolar_media21'])
+
+Nomes das colunas (com ``base='Cotacao_Dolar'``): ``Cotacao_Dolar`` (valor
+do dia), ``Cotacao_Dolar_lag{k}``, ``Cotacao_Dolar_media{w}`` e
+``Cotacao_Dolar_desvio{w}`` (desvio padrão amostral, ``ddof=1``, como o
+``rolling().std()`` do pandas). As janelas contam dias úteis do Brent.
+"""
+import functools
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from petroleo import CACHE_DIR, align, data
+
+FEATURES_DIR = CACHE_DIR / "features"
+FORMAT_VERSION = 2
+
+DEFAULT_LAGS = (1, 5, 21)
+DEFAULT_WINDOWS = (5, 21, 63)
+BASE = 'Cotacao_Dolar'
+
+
+def feature_names(lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, base=BASE):
+    return (
+        [base]
+        + [f"{base}_lag{k}" for k in lags]
+        + [f"{base}_media{w}" for w in windows]
+        + [f"{base}_desvio{w}" for w in windows]
+    )
+
+
+def build_features(valores, lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, base=BASE):
+    """Defasagens e estatísticas móveis de ``valores`` (NaN onde a janela não cabe).
+
+    Uma única janela deslizante do tamanho da maior janela serve a todas as
+    outras (são as suas últimas ``w`` colunas), então não há laço pela série.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    n = len(valores)
+    colunas = {base: valores}
+
+    for k in lags:
+        defasado = np.full(n, np.nan)
+        defasado[k:] = valores[:n - k]
+        colunas[f"{base}_lag{k}"] = defasado
+
+    maior = max(windows, default=0)
+    janelas = sliding_window_view(valores, maior) if 0 < maior <= n else None
+    for estatistica, funcao in (('media', np.mean), ('desvio', functools.partial(np.std, ddof=1))):
+        for w in windows:
+            resultado = np.full(n, np.nan)
+            if janelas is not None:
+                resultado[maior - 1:] = funcao(janelas[:, maior - w:], axis=1)
+                # As primeiras posições em que só a janela menor cabe.
+                if w < maior:
+                    resultado[w - 1:maior - 1] = funcao(sliding_window_view(valores[:maior - 1], w), axis=1)
+            colunas[f"{base}_{estatistica}{w}"] = resultado
+    return pd.DataFrame(colunas)
+
+
+def feature_version(lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS):
+    chave = json.dumps({
+        'format': FORMAT_VERSION,
+        'petroleo': data.dataset_version(data.PETROLEO_CSV, data.PETROLEO_COLUNA, 'Preço'),
+        'dolar': data.dataset_version(data.DOLAR_CSV, data.DOLAR_COLUNA, BASE),
+        'lags': list(lags),
+        'windows': list(windows),
+    }, sort_keys=True)
+    return hashlib.sha256(chave.encode()).hexdigest()[:16]
+
+
+def load_features(lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS, features_dir=FEATURES_DIR):
+    """Features no calendário do Brent (coluna ``ds``), lidas do cache quando possível."""
+    path = Path(features_dir) / f"{feature_version(lags, windows)}.parquet"
+    if path.exists():
+        return pd.read_parquet(path)
+
+    df = align.align(
+        data.load_petroleo()[['DATA']], data.load_dolar(),
+        calendar='left', tolerance='3D', direction='backward', fill='keep',
+    )
+    # Buracos maiores que a tolerância recebem a última cotação conhecida (não
+    # usa informação futura); só os dias antes do início da série do dólar
+    # ficam NaN e são descartados ao juntar com o treino em ``with_features``.
+    df_features = build_features(df[BASE].ffill().to_numpy(), lags, windows)
+    df_features.insert(0, 'ds', df['DATA'].to_numpy())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Temporário por processo e por thread: a página, o ``artifacts`` e os
+    # workers de ``series`` podem gerar o mesmo arquivo ao mesmo tempo.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    df_features.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return df_features
+
+
+def with_features(df, df_features, colunas):
+    """Junta ``colunas`` a ``df`` por ``ds`` e descarta as linhas sem valor."""
+    colunas = list(colunas)
+    if not colunas:
+        return df
+    desconhecidas = sorted(set(colunas) - set(df_features.columns))
+    if desconhecidas:
+        raise ValueError(f"Features desconhecidas: {desconhecidas}. Disponíveis: {list(df_features.columns[1:])}")
+    juntado = df.merge(df_features[['ds'] + colunas], on='ds', how='left')
+    return juntado.dropna(subset=colunas).reset_index(drop=True)
+
+
+def hold_last(df_features, colunas):
+    """Cenário futuro com cada feature mantida no último valor conhecido."""
+    ultima = df_features[list(colunas)].dropna().iloc[-1]
+    return {coluna: float(ultima[coluna]) for coluna in colunas}
@@ -0,0 +1,91 @@
+"""Previsão para vários horizontes e cenários com uma única chamada ao ``predict``.
+
+Em vez de chamar ``make_future_dataframe``/``predict`` uma vez por horizonte
+(ou por cenário), ``forecast`` monta um único DataFrame futuro até o maior
+horizonte, repetido por cenário, prevê tudo de uma vez e separa o resultado.
+Os horizontes menores são prefixos do maior.
+
+    resultado = forecast.forecast(model, [30, 90, 180], uncertainty_samples=0)
+    resultado[90]  # previsões até 90 dias após a última observação
+
+O intervalo de incerteza do Prophet é estimado por simulação e domina o tempo
+do ``predict``; com ``uncertainty_samples=0`` só a previsão pontual é
+calculada (sem ``yhat_lower``/``yhat_upper``), e valores menores que o do
+modelo reduzem o custo às custas de intervalos mais ruidosos.
+"""
+import numpy as np
+import pandas as pd
+
+COLUNAS = ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+
+
+def _timedelta(horizonte):
+    if isinstance(horizonte, (int, np.integer)):
+        return pd.Timedelta(days=int(horizonte))
+    return pd.Timedelta(horizonte)
+
+
+def future_frame(ultima_data, horizontes, scenarios=None, freq='B'):
+    """Datas após ``ultima_data`` até o maior horizonte, uma cópia por cenário.
+
+    ``scenarios`` mapeia o nome do cenário para as colunas extras do Prophet
+    (regressores, ``cap``/``floor``), cada uma com um escalar ou uma sequência
+    do tamanho do horizonte. Sem cenários é gerada uma única cópia, chamada
+    ``'base'``.
+    """
+    ultima_data = pd.Timestamp(ultima_data)
+    maximo = max(_timedelta(h) for h in horizontes)
+    datas = pd.date_range(ultima_data, ultima_data + maximo, freq=freq)
+    datas = datas[datas > ultima_data]
+
+    scenarios = scenarios or {'base': {}}
+    partes = []
+    for nome, colunas in scenarios.items():
+        parte = pd.DataFrame({'ds': datas})
+        for coluna, valor in colunas.items():
+            parte[coluna] = valor
+        parte['scenario'] = nome
+        partes.append(parte)
+    return pd.concat(partes, ignore_index=True)
+
+
+def forecast(model, horizons, scenarios=None, freq='B', uncertainty_samples=None, components=False):
+    """Prevê todos os ``horizons`` (dias ou ``'90 days'``) e cenários com um único ``predict``.
+
+    Retorna um dicionário horizonte -> DataFrame com ``scenario``, ``ds``,
+    ``horizon_days`` (dias corridos após a última observação do treino) e as
+    colunas de previsão; com ``components=True`` inclui também os componentes
+    (trend, sazonalidades, regressores).
+    """
+    ultima_data = model.history['ds'].max()
+    futuro = future_frame(ultima_data, horizons, scenarios, freq)
+
+    # O predict reordena as linhas por ds. Deslocar a i-ésima cópia em i
+    # nanossegundos deixa os ds únicos (sem mudar a previsão), e a mesma
+    # ordenação aplicada ao quadro futuro recupera o cenário de cada linha.
+    entrada = futuro.drop(columns='scenario')
+    entrada['ds'] += pd.to_timedelta(futuro.groupby('scenario', sort=False).ngroup(), unit='ns')
+    ordem = np.argsort(entrada['ds'].to_numpy(), kind='stable')
+
+    anterior = model.uncertainty_samples
+    if uncertainty_samples is not None:
+        model.uncertainty_samples = uncertainty_samples
+    try:
+        fcst = model.predict(entrada)
+    finally:
+        model.uncertainty_samples = anterior
+
+    colunas = [c for c in COLUNAS if c in fcst.columns]
+    if components:
+        colunas += [c for c in fcst.columns if c not in colunas]
+    resultado = fcst[colunas].copy()
+    resultado['ds'] = futuro['ds'].to_numpy()[ordem]
+    resultado.insert(0, 'scenario', futuro['scenario'].to_numpy()[ordem])
+    resultado.insert(2, 'horizon_days', (resultado['ds'] - ultima_data).dt.days)
+    # Volta à ordem do quadro futuro: cenários na ordem recebida, datas crescentes.
+    resultado = resultado.iloc[np.argsort(ordem)].reset_index(drop=True)
+
+    return {
+        h: resultado[resultado['ds'] <= ultima_data + _timedelta(h)].reset_index(drop=True)
+        for h in horizons
+    }
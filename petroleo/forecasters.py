@@ -0,0 +1,284 @@
+"""Modelos de previsão com a mesma interface do Prophet usado na página.
+
+Todos recebem um DataFrame com ``ds`` e ``y`` em ``fit`` e devolvem, em
+``predict``, um DataFrame com ``ds``, ``yhat``, ``yhat_lower`` e
+``yhat_upper`` (intervalo de 80%, a largura padrão do Prophet), então servem
+às mesmas métricas e gráficos.
+
+    modelo = forecasters.make('ses').fit(df_train)
+    previsao = modelo.predict(df_test)
+
+Os modelos simples (``naive``, ``seasonal_naive``, ``drift`` e ``ses``) são
+NumPy puro e ajustam em milissegundos; ``ets`` e ``arima`` usam o
+statsmodels e ``prophet`` o ajuste em disco de ``model_store``.
+
+As previsões contam os passos em dias úteis após a última data do treino,
+como na série do IPEA, que só tem cotações em dias úteis.
+"""
+import numpy as np
+import pandas as pd
+
+# Quantil da normal para o intervalo de 80% (``interval_width`` padrão do Prophet).
+INTERVAL_Z = 1.2815515655446004
+INTERVAL_ALPHA = 0.2
+
+
+def business_steps(ultima_data, ds):
+    """Número de dias úteis entre ``ultima_data`` e cada data de ``ds`` (mínimo 1)."""
+    inicio = np.datetime64(pd.Timestamp(ultima_data).date(), 'D')
+    fim = pd.to_datetime(pd.Series(ds)).to_numpy().astype('datetime64[D]')
+    return np.maximum(np.busday_count(inicio, fim), 1)
+
+
+class Forecaster:
+    """Interface comum: ``fit(df)`` com ``ds``/``y`` e ``predict(df)`` com ``ds``."""
+
+    name = None
+
+    @classmethod
+    def preload(cls):
+        """Importa as dependências pesadas, para que não entrem no tempo do primeiro ajuste."""
+
+    def fit(self, df):
+        y = np.asarray(df['y'], dtype=np.float64)
+        if len(y) < 2:
+            raise ValueError(f"{self.name}: são necessárias ao menos 2 observações, recebidas {len(y)}")
+        self.ultima_data = pd.Timestamp(df['ds'].max())
+        self._fit(y)
+        return self
+
+    def predict(self, df):
+        steps = business_steps(self.ultima_data, df['ds'])
+        yhat, sigma = self._forecast(steps)
+        return pd.DataFrame({
+            'ds': df['ds'].to_numpy(),
+            'yhat': yhat,
+            'yhat_lower': yhat - INTERVAL_Z * sigma,
+            'yhat_upper': yhat + INTERVAL_Z * sigma,
+        })
+
+    def _fit(self, y):
+        raise NotImplementedError
+
+    def _forecast(self, steps):
+        """Previsão e desvio-padrão do erro para cada passo à frente (arrays)."""
+        raise NotImplementedError
+
+
+class NaiveForecaster(Forecaster):
+    """Repete a última observação (passeio aleatório)."""
+
+    name = 'naive'
+
+    def _fit(self, y):
+        self.ultimo = y[-1]
+        self.sigma = np.std(np.diff(y), ddof=1)
+
+    def _forecast(self, steps):
+        return np.full(len(steps), self.ultimo), self.sigma * np.sqrt(steps)
+
+
+class SeasonalNaiveForecaster(Forecaster):
+    """Repete o último ciclo sazonal (por padrão, a última semana de 5 dias úteis)."""
+
+    name = 'seasonal_naive'
+
+    def __init__(self, season_length=5):
+        self.season_length = season_length
+
+    def _fit(self, y):
+        m = self.season_length
+        if len(y) <= m:
+            raise ValueError(f"{self.name}: são necessárias mais de {m} observações, recebidas {len(y)}")
+        self.ciclo = y[-m:]
+        self.sigma = np.std(y[m:] - y[:-m], ddof=1)
+
+    def _forecast(self, steps):
+        m = self.season_length
+        ciclos = (steps - 1) // m + 1
+        return self.ciclo[(steps - 1) % m], self.sigma * np.sqrt(ciclos)
+
+
+class DriftForecaster(Forecaster):
+    """Passeio aleatório com tendência igual à variação média do histórico."""
+
+    name = 'drift'
+
+    def _fit(self, y):
+        self.ultimo = y[-1]
+        self.n = len(y)
+        self.slope = (y[-1] - y[0]) / (self.n - 1)
+        self.sigma = np.std(np.diff(y) - self.slope, ddof=1)
+
+    def _forecast(self, steps):
+        return self.ultimo + self.slope * steps, self.sigma * np.sqrt(steps * (1 + steps / (self.n - 1)))
+
+
+class SimpleExpSmoothingForecaster(Forecaster):
+    """Suavização exponencial simples com ``alpha`` escolhido pelo erro um passo à frente.
+
+    O nível ``l_t = alpha * y_t + (1 - alpha) * l_{t-1}`` (com ``l_0 = y_0``) é
+    um filtro IIR de primeira ordem: para cada ``alpha`` da grade, o caminho
+    inteiro sai de uma chamada a ``scipy.signal.lfilter``, sem laço pela série.
+    """
+
+    name = 'ses'
+
+    def __init__(self, alphas=None):
+        self.alphas = np.linspace(0.01, 0.99, 99) if alphas is None else np.asarray(alphas)
+
+    @classmethod
+    def preload(cls):
+        from scipy.signal import lfilter
+
+        return lfilter
+
+    def _fit(self, y):
+        lfilter = self.preload()
+        niveis = np.empty(len(self.alphas))
+        sse = np.empty(len(self.alphas))
+        for i, alpha in enumerate(self.alphas):
+            # ``zi`` é o termo ``(1 - alpha) * l_0`` da primeira saída.
+            caminho = lfilter([alpha], [1.0, alpha - 1.0], y[1:], zi=[(1.0 - alpha) * y[0]])[0]
+            # A previsão um passo à frente de y_t é o nível l_{t-1}.
+            erro = y[1:] - np.concatenate(([y[0]], caminho[:-1]))
+            sse[i] = erro @ erro
+            niveis[i] = caminho[-1]
+        melhor = int(np.argmin(sse))
+        self.alpha = float(self.alphas[melhor])
+        self.nivel = niveis[melhor]
+        self.sigma = np.sqrt(sse[melhor] / (len(y) - 1))
+
+    def _forecast(self, steps):
+        return np.full(len(steps), self.nivel), self.sigma * np.sqrt(1 + (steps - 1) * self.alpha ** 2)
+
+
+class _StatsmodelsForecaster(Forecaster):
+    """Base dos modelos do statsmodels: prevê até o maior passo e seleciona os pedidos."""
+
+    def _forecast(self, steps):
+        media, inferior, superior = self._get_forecast(int(steps.max()))
+        sigma = (superior - inferior) / (2 * INTERVAL_Z)
+        return media[steps - 1], sigma[steps - 1]
+
+
+class ETSForecaster(_StatsmodelsForecaster):
+    """ETS com erro aditivo e tendência aditiva amortecida (statsmodels ``ETSModel``)."""
+
+    name = 'ets'
+
+    def __init__(self, trend='add', damped_trend=True):
+        self.trend = trend
+        self.damped_trend = damped_trend
+
+    @classmethod
+    def preload(cls):
+        from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+
+        return ETSModel
+
+    def _fit(self, y):
+        ETSModel = self.preload()
+        self.resultado = ETSModel(pd.Series(y), error='add', trend=self.trend, damped_trend=self.damped_trend).fit(disp=False)
+
+    def _get_forecast(self, passos):
+        n = self.resultado.nobs
+        tabela = self.resultado.get_prediction(start=n, end=n + passos - 1).summary_frame(alpha=INTERVAL_ALPHA)
+        return tabela['mean'].to_numpy(), tabela['pi_lower'].to_numpy(), tabela['pi_upper'].to_numpy()
+
+
+class ARIMAForecaster(_StatsmodelsForecaster):
+    """ARIMA(p, d, q) do statsmodels, por padrão ARIMA(1, 1, 1)."""
+
+    name = 'arima'
+
+    def __init__(self, order=(1, 1, 1)):
+        self.order = tuple(order)
+
+    @classmethod
+    def preload(cls):
+        from statsmodels.tsa.arima.model import ARIMA
+
+        return ARIMA
+
+    def _fit(self, y):
+        ARIMA = self.preload()
+        self.resultado = ARIMA(y, order=self.order).fit()
+
+    def _get_forecast(self, passos):
+        tabela = self.resultado.get_forecast(passos).summary_frame(alpha=INTERVAL_ALPHA)
+        return tabela['mean'].to_numpy(), tabela['mean_ci_lower'].to_numpy(), tabela['mean_ci_upper'].to_numpy()
+
+
+class ProphetForecaster(Forecaster):
+    """O Prophet da página, ajustado (ou lido do disco) via ``model_store``.
+
+    Com ``use_store=False`` o ajuste sempre acontece, o que serve para medir o
+    custo real de treino na comparação com os outros modelos. ``regressors``
+    são colunas de ``df`` (ver ``petroleo.features``) exigidas também no
+    ``predict``.
+    """
+
+    name = 'prophet'
+
+    def __init__(self, params=None, use_store=True, regressors=()):
+        self.params = params or {}
+        self.use_store = use_store
+        self.regressors = list(regressors)
+
+    @classmethod
+    def preload(cls):
+        from prophet import Prophet
+
+        return Prophet
+
+    def fit(self, df):
+        if self.use_store:
+            from petroleo import model_store
+
+            self.model = model_store.fit_or_load(df, self.params, regressors=self.regressors)
+        else:
+            self.model = self.preload()(**self.params)
+            for nome in self.regressors:
+                self.model.add_regressor(nome)
+            self.model.fit(df)
+        self.ultima_data = pd.Timestamp(df['ds'].max())
+        return self
+
+    def predict(self, df):
+        fcst = self.model.predict(df[['ds', *self.regressors]])
+        return fcst[['ds', 'yhat', 'yhat_lower', 'yhat_upper']]
+
+
+FORECASTERS = {
+    cls.name: cls
+    for cls in (
+        NaiveForecaster,
+        SeasonalNaiveForecaster,
+        DriftForecaster,
+        SimpleExpSmoothingForecaster,
+        ETSForecaster,
+        ARIMAForecaster,
+        ProphetForecaster,
+    )
+}
+
+NOMES = {
+    'naive': 'Ingênuo',
+    'seasonal_naive': 'Ingênuo sazonal (5 dias)',
+    'drift': 'Ingênuo com tendência',
+    'ses': 'Suavização exponencial simples',
+    'ets': 'ETS (tendência amortecida)',
+    'arima': 'ARIMA(1,1,1)',
+    'prophet': 'Prophet',
+    'prophet_dolar': 'Prophet + dólar (cotação realizada)',
+}
+
+
+def make(nome, **kwargs):
+    """Instancia o modelo ``nome`` (uma das chaves de ``FORECASTERS``)."""
+    try:
+        cls = FORECASTERS[nome]
+    except KeyError:
+        raise ValueError(f"Modelo desconhecido: {nome!r}. Disponíveis: {', '.join(FORECASTERS)}") from None
+    return cls(**kwargs)
@@ -0,0 +1,204 @@
+"""Instrumentação leve das etapas de cada página (tempo, memória e cache).
+
+Uso nas páginas::
+
+    @st.cache_data
+    @instrument.tracks_cache
+    def load_dados(...):
+        ...
+
+    with instrument.page('principal'):
+        with instrument.stage('load', cached=True):
+            df = load_dados(...)
+
+        with instrument.stage('render'):
+            st.plotly_chart(fig)
+
+A coleta só fica ativa com ``PETROLEO_DEBUG=1`` no ambiente ou ``?debug=1``
+na URL; fora disso ``stage`` não mede nada. Ativa, cada etapa registra a
+duração, a variação de memória alocada e o pico (``tracemalloc``) e, com
+``cached=True``, se a função em cache foi executada (``miss``) ou não
+(``hit``). Ao sair do bloco de ``page`` (``begin`` + ``finish``), mesmo
+por ``st.stop()`` ou por uma exceção, a coleta é encerrada, a tabela aparece
+na barra lateral e os registros são acrescentados em
+``.cache/metrics/stages.jsonl``.
+
+O ``tracemalloc`` é global ao processo: ele é ligado pela primeira sessão
+em debug e só é desligado quando a última termina (e nunca se já estava
+ligado por outro motivo). Com várias sessões simultâneas os valores de
+memória incluem alocações das outras sessões.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+
+from petroleo import CACHE_DIR
+
+METRICS_DIR = CACHE_DIR / "metrics"
+METRICS_FILE = "stages.jsonl"
+
+_estado = threading.local()
+_lock_arquivo = threading.Lock()
+
+# Execuções em debug usando o ``tracemalloc`` e se foi este módulo que o ligou.
+_lock_tracemalloc = threading.Lock()
+_usuarios_tracemalloc = 0
+_ligou_tracemalloc = False
+
+
+def _debug_requested():
+    if os.environ.get("PETROLEO_DEBUG", "") not in ("", "0"):
+        return True
+    try:
+        import streamlit as st
+
+        return st.query_params.get("debug", "0") not in ("", "0")
+    except Exception:
+        return False
+
+
+def _acquire_tracemalloc():
+    global _usuarios_tracemalloc, _ligou_tracemalloc
+    with _lock_tracemalloc:
+        if _usuarios_tracemalloc == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _ligou_tracemalloc = True
+        _usuarios_tracemalloc += 1
+
+
+def _release_tracemalloc():
+    global _usuarios_tracemalloc, _ligou_tracemalloc
+    with _lock_tracemalloc:
+        _usuarios_tracemalloc -= 1
+        if _usuarios_tracemalloc == 0 and _ligou_tracemalloc:
+            tracemalloc.stop()
+            _ligou_tracemalloc = False
+
+
+def begin(pagina, enabled=None):
+    """Inicia a coleta de uma execução da página (o Streamlit reexecuta o script a cada interação).
+
+    Prefira ``page``, que garante o ``finish``.
+    """
+    enabled = _debug_requested() if enabled is None else enabled
+    anterior = _run()
+    if anterior and anterior['enabled']:
+        # Execução anterior desta thread que não chegou ao ``finish``.
+        _release_tracemalloc()
+    if enabled:
+        _acquire_tracemalloc()
+    _estado.run = {
+        'id': uuid.uuid4().hex[:12],
+        'page': pagina,
+        'enabled': enabled,
+        'stages': [],
+        'stack': [],
+    }
+
+
+def _run():
+    return getattr(_estado, 'run', None)
+
+
+def enabled():
+    run = _run()
+    return bool(run and run['enabled'])
+
+
+@contextmanager
+def stage(nome, cached=False):
+    """Mede o bloco como uma etapa; com ``cached=True`` registra hit/miss do cache."""
+    run = _run()
+    if not (run and run['enabled']):
+        yield
+        return
+
+    atual, pico = tracemalloc.get_traced_memory()
+    # O reset do pico abaixo apagaria o pico das etapas externas ainda abertas.
+    for aberta in run['stack']:
+        aberta['peak'] = max(aberta['peak'], pico)
+    tracemalloc.reset_peak()
+    registro = {'stage': nome, 'cache': 'hit' if cached else None, 'mem_start': atual, 'peak': atual}
+    run['stack'].append(registro)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        fim, pico = tracemalloc.get_traced_memory()
+        run['stack'].pop()
+        run['stages'].append({
+            'stage': nome,
+            'seconds': round(segundos, 6),
+            'alloc_kb': round((fim - registro['mem_start']) / 1024, 1),
+            'peak_kb': round((max(registro['peak'], pico) - registro['mem_start']) / 1024, 1),
+            'cache': registro['cache'],
+        })
+
+
+def tracks_cache(func):
+    """Marca como ``miss`` a etapa aberta quando a função em cache realmente executa.
+
+    Deve ficar abaixo de ``@st.cache_data``/``@st.cache_resource``, para só rodar
+    quando o Streamlit não encontra o resultado no cache.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        run = _run()
+        if run and run['stack']:
+            run['stack'][-1]['cache'] = 'miss'
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def export(registros, metrics_dir=METRICS_DIR):
+    """Acrescenta os registros (um JSON por linha) em ``metrics_dir/stages.jsonl``."""
+    if not registros:
+        return
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    linhas = "".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros)
+    with _lock_arquivo, open(metrics_dir / METRICS_FILE, "a", encoding="utf-8") as f:
+        f.write(linhas)
+
+
+def finish(metrics_dir=METRICS_DIR):
+    """Encerra a coleta: mostra as etapas na barra lateral e exporta em JSON lines."""
+    run = _run()
+    _estado.run = None
+    if not (run and run['enabled']):
+        return []
+    _release_tracemalloc()
+
+    instante = time.strftime('%Y-%m-%dT%H:%M:%S')
+    registros = [{'ts': instante, 'run': run['id'], 'page': run['page'], **etapa} for etapa in run['stages']]
+    export(registros, metrics_dir)
+
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Etapas da página", expanded=True):
+        if registros:
+            df = pd.DataFrame(run['stages']).rename(columns={
+                'stage': 'Etapa', 'seconds': 'Tempo (s)', 'alloc_kb': 'Alocado (KB)',
+                'peak_kb': 'Pico (KB)', 'cache': 'Cache',
+            })
+            st.dataframe(df, hide_index=True, use_container_width=True)
+            st.caption(f"Total: {sum(etapa['seconds'] for etapa in run['stages']):.3f} s · execução {run['id']}")
+        else:
+            st.caption("Nenhuma etapa registrada.")
+    return registros
+
+
+@contextmanager
+def page(pagina, enabled=None, metrics_dir=METRICS_DIR):
+    """``begin`` na entrada e ``finish`` na saída do bloco, inclusive por ``st.stop()`` ou exceção."""
+    begin(pagina, enabled)
+    try:
+        yield
+    finally:
+        finish(metrics_dir)
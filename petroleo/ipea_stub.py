@@ -0,0 +1,123 @@
+"""Servidor HTTP local que imita a exportação CSV do ipeadata, para testar o ``refresh`` sem rede.
+
+Serve ``/<serie>.csv`` a partir de ``<data-dir>/<serie>.csv`` (por padrão, os
+CSVs do repositório com os códigos de série de ``refresh.SOURCES``), no mesmo
+formato do ipeadata. Com ``?desde=aaaa-mm-dd`` devolve só o cabeçalho e as
+linhas posteriores a essa data. As respostas trazem ``ETag`` (hash do arquivo)
+e ``Last-Modified``, respondem 304 a ``If-None-Match`` / ``If-Modified-Since``
+e mantêm a conexão aberta (HTTP/1.1). ``--fail N`` faz as N primeiras
+requisições responderem 503, para exercitar as novas tentativas.
+
+    python -m petroleo.ipea_stub --port 8765
+    python -m petroleo.ipea_stub --port 8765 --data-dir /tmp/ipea --fail 2
+"""
+import argparse
+import hashlib
+import os
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from petroleo import data
+
+
+def _filter_rows(conteudo, desde):
+    """Cabeçalho + linhas com data posterior a ``desde`` (mantendo a ordem do arquivo)."""
+    fim_cabecalho = conteudo.index(b"\n") + 1
+    linhas = [linha for linha in conteudo[fim_cabecalho:].split(b"\n") if linha.strip()]
+    if not linhas:
+        return conteudo[:fim_cabecalho]
+    datas = data.parse_ipea_dates([linha.split(b";")[0].strip() for linha in linhas])
+    manter = np.flatnonzero(datas > desde)
+    return conteudo[:fim_cabecalho] + b"".join(linhas[i] + b"\n" for i in manter)
+
+
+class IPEAHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    arquivos = {}
+    falhas_restantes = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        serie = Path(url.path).stem
+        path = self.arquivos.get(serie)
+        classe = type(self)
+        with classe.lock:
+            falhar = classe.falhas_restantes > 0
+            classe.falhas_restantes -= falhar
+        if falhar:
+            return self._send(503, b"", {'Retry-After': '0'})
+        if path is None or not Path(path).exists():
+            return self._send(404, f"Série desconhecida: {serie}\n".encode())
+
+        with open(path, "rb") as f:
+            conteudo = f.read()
+        stat = os.stat(path)
+        etag = f'"{hashlib.sha256(conteudo).hexdigest()[:16]}"'
+        validadores = {'ETag': etag, 'Last-Modified': formatdate(int(stat.st_mtime), usegmt=True)}
+
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, b"", validadores)
+        if 'If-None-Match' not in self.headers and self.headers.get('If-Modified-Since'):
+            try:
+                if int(stat.st_mtime) <= parsedate_to_datetime(self.headers['If-Modified-Since']).timestamp():
+                    return self._send(304, b"", validadores)
+            except (TypeError, ValueError):
+                pass
+
+        desde = parse_qs(url.query).get('desde')
+        if desde:
+            conteudo = _filter_rows(conteudo, np.datetime64(desde[0]))
+        self._send(200, conteudo, {**validadores, 'Content-Type': 'text/csv; charset=windows-1252'})
+
+    def _send(self, status, corpo, headers=None):
+        self.send_response(status)
+        for nome, valor in (headers or {}).items():
+            self.send_header(nome, valor)
+        if status != 304:
+            self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        # Inclui a porta do cliente: com keep-alive, as requisições de um mesmo
+        # refresh chegam pela mesma porta.
+        print(f"{self.client_address[0]}:{self.client_address[1]} {formato % args}", flush=True)
+
+
+def make_server(arquivos, host='127.0.0.1', port=8765, fail=0):
+    """Servidor para ``arquivos`` ({série: caminho do CSV}); ``port=0`` escolhe uma porta livre."""
+    handler = type('Handler', (IPEAHandler,), {'arquivos': dict(arquivos), 'falhas_restantes': fail})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    from petroleo.refresh import SOURCES
+
+    parser = argparse.ArgumentParser(description="Servidor local no formato CSV do ipeadata")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--data-dir', help='diretório com <serie>.csv (padrão: os CSVs do repositório)')
+    parser.add_argument('--fail', type=int, default=0, help='responde 503 às N primeiras requisições')
+    args = parser.parse_args()
+
+    if args.data_dir:
+        arquivos = {path.stem: path for path in Path(args.data_dir).glob("*.csv")}
+    else:
+        arquivos = {config['serie']: config['path'] for config in SOURCES.values()}
+    server = make_server(arquivos, args.host, args.port, args.fail)
+    print(f"Servindo {', '.join(sorted(arquivos))} em http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
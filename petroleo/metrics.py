@@ -0,0 +1,30 @@
+"""Métricas de erro usadas na avaliação das previsões.
+
+Implementadas direto em NumPy: o RMSE e o MAE não justificam importar o
+scikit-learn só para isso.
+"""
+import numpy as np
+
+
+def mean_absolute_percentage_error(y_true, y_pred):
+    y_true, y_pred = np.array(y_true), np.array(y_pred)
+    non_zero = y_true != 0
+    return np.mean(np.abs((y_true[non_zero] - y_pred[non_zero]) / y_true[non_zero])) * 100
+
+
+def mean_absolute_error(y_true, y_pred):
+    y_true, y_pred = np.asarray(y_true, dtype=np.float64), np.asarray(y_pred, dtype=np.float64)
+    return np.mean(np.abs(y_true - y_pred))
+
+
+def root_mean_squared_error(y_true, y_pred):
+    y_true, y_pred = np.asarray(y_true, dtype=np.float64), np.asarray(y_pred, dtype=np.float64)
+    return np.sqrt(np.mean((y_true - y_pred) ** 2))
+
+
+def error_metrics(y_true, y_pred):
+    return {
+        'rmse': root_mean_squared_error(y_true, y_pred),
+        'mae': mean_absolute_error(y_true, y_pred),
+        'mape': mean_absolute_percentage_error(y_true, y_pred),
+    }
@@ -0,0 +1,104 @@
+"""Armazenamento em disco dos modelos Prophet já ajustados.
+
+Cada modelo é salvo com uma chave derivada do nome da série, do conteúdo do
+conjunto de treino e dos hiperparâmetros, de modo que um novo ajuste só
+acontece quando o CSV ou a data de corte mudam. O ponteiro do warm-start
+(``latest-<série>-<hiperparâmetros>.txt``) também é por série: ajustes
+simultâneos do Brent e do dólar não partem um do modelo do outro.
+"""
+import hashlib
+import json
+from importlib import metadata
+from pathlib import Path
+
+import pandas as pd
+
+from petroleo import CACHE_DIR, write_text_atomic
+
+MODEL_DIR = CACHE_DIR / "models"
+# Identificador padrão: o Brent em dólares, como em ``series.SERIES``.
+DEFAULT_SERIES = 'brent_usd'
+
+
+def model_key(df_train, params, regressors=(), series=DEFAULT_SERIES):
+    digest = hashlib.sha256(series.encode())
+    digest.update(pd.util.hash_pandas_object(df_train[['ds', 'y', *regressors]], index=False).values.tobytes())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    if regressors:
+        digest.update(json.dumps(list(regressors)).encode())
+    digest.update(metadata.version('prophet').encode())
+    return digest.hexdigest()[:20]
+
+
+def params_key(params, regressors=()):
+    chave = json.dumps(params, sort_keys=True)
+    if regressors:
+        chave += json.dumps(list(regressors))
+    return hashlib.sha256(chave.encode()).hexdigest()[:20]
+
+
+def warm_start_init(model):
+    """Valores iniciais para o Stan a partir dos parâmetros de um modelo ajustado.
+
+    Segue a receita de "warm-start" da documentação do Prophet: reaproveita
+    ``k``, ``m``, ``sigma_obs``, ``delta`` e ``beta`` do ajuste anterior, o
+    que reduz bastante as iterações do otimizador quando só chegaram
+    alguns dias novos.
+    """
+    return {
+        'k': model.params['k'][0][0],
+        'm': model.params['m'][0][0],
+        'sigma_obs': model.params['sigma_obs'][0][0],
+        'delta': model.params['delta'][0],
+        'beta': model.params['beta'][0],
+    }
+
+
+def _latest_path(params, model_dir, regressors, series):
+    return Path(model_dir) / f"latest-{series}-{params_key(params, regressors)}.txt"
+
+
+def load_latest(params, model_dir=MODEL_DIR, regressors=(), series=DEFAULT_SERIES):
+    """Último modelo salvo da série com os mesmos hiperparâmetros (e regressores), se houver."""
+    from prophet.serialize import model_from_json
+
+    latest_path = _latest_path(params, model_dir, regressors, series)
+    try:
+        with open(latest_path) as f:
+            model_path = Path(model_dir) / f.read().strip()
+        with open(model_path) as f:
+            return model_from_json(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def fit_or_load(df_train, params, model_dir=MODEL_DIR, warm_start=True, regressors=(), series=DEFAULT_SERIES):
+    """Retorna o modelo salvo para (series, df_train, params) ou ajusta e salva um novo.
+
+    Com ``warm_start`` o novo ajuste parte dos parâmetros do último modelo
+    salvo da mesma série com os mesmos hiperparâmetros (p.ex. o de ontem,
+    antes de chegarem as cotações do dia). ``regressors`` são colunas de
+    ``df_train`` usadas com ``add_regressor`` (ver ``petroleo.features``);
+    ``series`` identifica a série de ``df_train`` (as chaves de
+    ``series.SERIES``).
+    """
+    from prophet import Prophet
+    from prophet.serialize import model_from_json, model_to_json
+
+    regressors = tuple(regressors)
+    path = Path(model_dir) / f"prophet-{model_key(df_train, params, regressors, series)}.json"
+    if path.exists():
+        with open(path) as f:
+            return model_from_json(f.read())
+
+    anterior = load_latest(params, model_dir, regressors, series) if warm_start and not params.get('mcmc_samples') else None
+    model = Prophet(**params)
+    for nome in regressors:
+        model.add_regressor(nome)
+    if anterior is not None:
+        model.fit(df_train, init=warm_start_init(anterior))
+    else:
+        model.fit(df_train)
+    write_text_atomic(path, model_to_json(model))
+    write_text_atomic(_latest_path(params, model_dir, regressors, series), path.name)
+    return model
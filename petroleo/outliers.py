@@ -0,0 +1,82 @@
+"""Detecção de outliers por z-score em janela móvel.
+
+``rolling_zscore`` é a versão vetorizada usada pela página de análise e
+reproduz ``rolling(window, center=True)`` do pandas sem criar colunas
+auxiliares no DataFrame. ``RollingZScore`` é a versão em fluxo, para
+cotações que chegam uma a uma: mantém só um buffer circular do tamanho da
+janela e atualiza média e variância em O(1) por valor (Welford com remoção
+do valor que sai da janela).
+"""
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+RESYNC_JANELAS = 1024
+
+
+def rolling_zscore(values, window=12, threshold=2.0, center=True):
+    """Retorna ``(z_score, outlier)`` para cada posição de ``values``.
+
+    O z-score compara cada valor com a média e o desvio padrão amostral da
+    sua janela (centrada, como no pandas, ou terminando nele). Posições sem
+    janela completa ficam com ``NaN`` e nunca são marcadas como outlier.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    z_score = np.full(len(values), np.nan)
+    if len(values) >= window:
+        janelas = sliding_window_view(values, window)
+        inicio = window // 2 if center else window - 1
+        alvo = values[inicio:inicio + len(janelas)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_score[inicio:inicio + len(janelas)] = (alvo - janelas.mean(axis=1)) / janelas.std(axis=1, ddof=1)
+    with np.errstate(invalid='ignore'):
+        outlier = np.abs(z_score) > threshold
+    return z_score, outlier
+
+
+class RollingZScore:
+    """Z-score de cada novo valor em relação aos últimos ``window`` valores (inclusive ele)."""
+
+    def __init__(self, window=12, threshold=2.0):
+        if window < 2:
+            raise ValueError("window deve ser pelo menos 2")
+        self.window = window
+        self.threshold = threshold
+        self._buffer = np.empty(window)
+        self._posicao = 0
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def std(self):
+        n = min(self.count, self.window)
+        return math.sqrt(max(self._m2, 0.0) / (n - 1)) if n > 1 else math.nan
+
+    def push(self, value):
+        """Inclui ``value`` e retorna ``(z_score, outlier)``; ``NaN`` até a janela encher."""
+        value = float(value)
+        if self.count < self.window:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self._m2 += delta * (value - self.mean)
+        else:
+            antigo = self._buffer[self._posicao]
+            media_anterior = self.mean
+            self.mean += (value - antigo) / self.window
+            self._m2 += (value - antigo) * (value - self.mean + antigo - media_anterior)
+            self.count += 1
+        self._buffer[self._posicao] = value
+        self._posicao = (self._posicao + 1) % self.window
+        if self._posicao == 0 and self.count % (self.window * RESYNC_JANELAS) == 0:
+            # Recalcula a partir do buffer para não acumular erro de arredondamento.
+            self.mean = float(self._buffer.mean())
+            self._m2 = float(((self._buffer - self.mean) ** 2).sum())
+
+        if self.count < self.window:
+            return math.nan, False
+        std = self.std
+        z_score = (value - self.mean) / std if std > 0 else math.nan
+        return z_score, abs(z_score) > self.threshold
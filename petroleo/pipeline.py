@@ -0,0 +1,327 @@
+"""Análise completa sem o Streamlit, para rodar em cron ou em um worker.
+
+Executa as etapas das páginas — leitura dos CSVs, alinhamento
+petróleo/dólar, estatísticas, outliers anotados com os eventos, previsão do
+Prophet e séries em reais — e grava os resultados (Parquet, JSON e os
+gráficos em HTML) em um diretório:
+
+    python -m petroleo --out resultados
+    python -m petroleo --out resultados --stages estatisticas outliers --workers 2
+
+As etapas de análise são nós de um grafo endereçado por conteúdo
+(``petroleo.dag``): a chave de cada nó vem das versões dos dados de que ele
+realmente depende, então uma cotação nova do dólar não invalida os outliers
+do Brent. Os valores intermediários ficam no cache do grafo, em memória e
+em disco. A chave de cada etapa e os arquivos gerados ficam em
+``manifest.json``: se a chave não mudou e os arquivos existem, a etapa é
+pulada. Etapas independentes rodam em paralelo, em threads (o trabalho
+pesado — Stan, backtesting e séries — já roda em subprocessos).
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from petroleo import (
+    CACHE_DIR, align, artifacts, charts, dag, data, downsample, events, outliers, series, shared, stats, tuning,
+    write_text_atomic,
+)
+
+OUT_DIR = CACHE_DIR / "pipeline"
+FORMAT_VERSION = 1
+
+JANELA_MOVEL = 252
+JANELA_OUTLIERS = 12
+
+
+def _save_parquet(out_dir, nome, df):
+    tmp_path = Path(out_dir) / f".{nome}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, Path(out_dir) / nome)
+    return nome
+
+
+def _save_json(out_dir, nome, valor):
+    write_text_atomic(Path(out_dir) / nome, json.dumps(valor, indent=2, ensure_ascii=False, default=str))
+    return nome
+
+
+def _save_html(out_dir, nome, fig):
+    write_text_atomic(Path(out_dir) / nome, fig.to_html(include_plotlyjs='cdn'))
+    return nome
+
+
+def load_petroleo():
+    return shared.load_series(data.PETROLEO_CSV, data.PETROLEO_COLUNA, 'Preço').rename(columns={'Preço': 'Preço_Petróleo'})
+
+
+def load_dolar():
+    return shared.load_series(data.DOLAR_CSV, data.DOLAR_COLUNA, 'Cotacao_Dolar')
+
+
+def align_series(df_petroleo, df_dolar):
+    return align.align(df_petroleo, df_dolar, on='DATA', calendar='union', tolerance='3D', direction='backward', fill='drop')
+
+
+def pair_series(df_petroleo, df_dolar):
+    """Só as datas com cotação nos dois mercados, sem preenchimento (o antigo ``merge`` interno).
+
+    As estatísticas de relação usam este calendário: na união, os dias só do
+    Brent repetiriam a última cotação do dólar e puxariam a correlação para baixo.
+    """
+    return align.align(df_petroleo, df_dolar, on='DATA', calendar='intersection', tolerance='0D', fill='drop')
+
+
+def relationship_stats(df_combinado):
+    return stats.relationship_stats(df_combinado['Preço_Petróleo'], df_combinado['Cotacao_Dolar'])
+
+
+def rolling_stats(df_combinado, janela):
+    x, y = df_combinado['Preço_Petróleo'].to_numpy(), df_combinado['Cotacao_Dolar'].to_numpy()
+    return pd.DataFrame({
+        'DATA': df_combinado['DATA'],
+        'Pearson': stats.rolling_pearson(x, y, janela),
+        'Spearman': stats.rolling_spearman(x, y, janela),
+        'Beta': stats.rolling_beta(x, y, janela),
+    }).dropna()
+
+
+def detect_outliers(df_petroleo, catalogo, janela):
+    """``(normais, outliers)``; os outliers com o z-score e o evento mais próximo."""
+    z_score, outlier = outliers.rolling_zscore(df_petroleo['Preço_Petróleo'].to_numpy(), window=janela, threshold=2)
+    normais = df_petroleo[~np.isnan(z_score) & ~outlier]
+    df_outliers = events.annotate(df_petroleo[outlier], catalogo)
+    df_outliers.insert(2, 'z_score', z_score[outlier])
+    return normais, df_outliers
+
+
+def analysis_graph(cache=None, janela_movel=JANELA_MOVEL, janela_outliers=JANELA_OUTLIERS):
+    """Grafo das etapas de análise (ver ``petroleo.dag``), com as versões atuais dos dados.
+
+    Levanta ``FileNotFoundError`` se um CSV não existir e ``ValueError`` se
+    faltar a coluna esperada.
+    """
+    grafo = dag.Graph(cache, namespace=f"analise-{FORMAT_VERSION}")
+    petroleo = grafo.source('petroleo', data.dataset_version(data.PETROLEO_CSV, data.PETROLEO_COLUNA, 'Preço'), load_petroleo)
+    dolar = grafo.source('dolar', data.dataset_version(data.DOLAR_CSV, data.DOLAR_COLUNA, 'Cotacao_Dolar'), load_dolar)
+    eventos = grafo.source('eventos', events.catalog_version(), events.load_catalog)
+    grafo.stage('alinhamento', align_series, petroleo, dolar)
+    pareado = grafo.stage('pareado', pair_series, petroleo, dolar)
+    grafo.stage('estatisticas', relationship_stats, pareado)
+    grafo.stage('correlacao_movel', rolling_stats, pareado, janela=janela_movel)
+    grafo.stage('outliers', detect_outliers, petroleo, eventos, janela=janela_outliers)
+    return grafo
+
+
+def _run_dados(grafo, out_dir, max_workers):
+    return [
+        _save_parquet(out_dir, "petroleo.parquet", grafo['petroleo'].value()),
+        _save_parquet(out_dir, "dolar.parquet", grafo['dolar'].value()),
+    ]
+
+
+def _run_alinhamento(grafo, out_dir, max_workers):
+    df_combinado = grafo['alinhamento'].value()
+    fig = charts.oil_vs_dollar_chart(
+        downsample.downsample(df_combinado, 'DATA', 'Preço_Petróleo'),
+        downsample.downsample(df_combinado, 'DATA', 'Cotacao_Dolar'),
+    )
+    return [
+        _save_parquet(out_dir, "alinhado.parquet", df_combinado),
+        _save_html(out_dir, "dolar_petroleo.html", fig),
+    ]
+
+
+def _run_estatisticas(grafo, out_dir, max_workers):
+    df_pareado = grafo['pareado'].value()
+    estatisticas = grafo['estatisticas'].value()
+    df_movel = grafo['correlacao_movel'].value()
+    return [
+        _save_json(out_dir, "estatisticas.json", estatisticas),
+        _save_parquet(out_dir, "correlacao_movel.parquet", df_movel),
+        _save_html(out_dir, "regressao.html", charts.regression_chart(df_pareado, estatisticas)),
+        _save_html(out_dir, "correlacao_movel.html", charts.rolling_relationship_chart(df_movel)),
+    ]
+
+
+def _run_outliers(grafo, out_dir, max_workers):
+    normais, df_outliers = grafo['outliers'].value()
+    return [
+        _save_parquet(out_dir, "outliers.parquet", df_outliers),
+        _save_html(out_dir, "outliers.html", charts.outlier_chart(normais, df_outliers)),
+    ]
+
+
+def _node_keys(*nomes):
+    return lambda grafo: {nome: grafo[nome].key for nome in nomes}
+
+
+def _inputs_previsao(grafo):
+    return {'artefatos': artifacts.current_version()[0]}
+
+
+def _run_previsao(grafo, out_dir, max_workers):
+    destino = artifacts.build(max_workers=max_workers)
+    artefatos = artifacts.load(destino.name)
+    df_real = artefatos['history']
+    df_futuro = artefatos['future']
+    return [
+        _save_parquet(out_dir, "previsao.parquet", artefatos['forecast']),
+        _save_parquet(out_dir, "previsao_futura.parquet", df_futuro),
+        _save_parquet(out_dir, "backtest.parquet", artefatos['backtest']),
+        _save_parquet(out_dir, "modelos.parquet", artefatos['models']),
+        _save_json(out_dir, "previsao.json", artefatos['metrics']),
+        _save_html(out_dir, "previsao.html", charts.forecast_chart(df_real, artefatos['forecast'], artefatos['changepoints'])),
+        _save_html(out_dir, "previsao_futura.html", charts.future_chart(
+            df_real[df_real['ds'] > df_real['ds'].max() - pd.Timedelta(days=365)], df_futuro,
+        )),
+    ]
+
+
+def _inputs_series(grafo):
+    params = tuning.load_best_params()
+    return {series_id: series.series_version(series_id, params) for series_id in series.SERIES}
+
+
+def _run_series(grafo, out_dir, max_workers):
+    versoes = series.build_all(max_workers=max_workers)
+    saidas, metricas = [], {}
+    for series_id, versao in versoes.items():
+        resultados = series.load_results(series_id, versao)
+        metricas[series_id] = resultados['metrics']
+        saidas.append(_save_parquet(out_dir, f"series_{series_id}_previsao_futura.parquet", resultados['future']))
+    saidas.append(_save_json(out_dir, "series.json", metricas))
+    return saidas
+
+
+# Em ordem topológica: cada etapa vem depois das suas dependências. As
+# dependências só ordenam a execução (os valores intermediários vêm do grafo,
+# em memória); as entradas de cada etapa são as chaves dos nós que ela grava.
+STAGES = {
+    'dados': {'deps': [], 'inputs': _node_keys('petroleo', 'dolar'), 'run': _run_dados},
+    'alinhamento': {'deps': ['dados'], 'inputs': _node_keys('alinhamento'), 'run': _run_alinhamento},
+    'estatisticas': {'deps': ['dados'], 'inputs': _node_keys('estatisticas', 'correlacao_movel'), 'run': _run_estatisticas},
+    'outliers': {'deps': ['dados'], 'inputs': _node_keys('outliers'), 'run': _run_outliers},
+    'previsao': {'deps': [], 'inputs': _inputs_previsao, 'run': _run_previsao},
+    'series': {'deps': [], 'inputs': _inputs_series, 'run': _run_series},
+}
+
+
+def _with_deps(nomes):
+    """``nomes`` e todas as suas dependências, na ordem de ``STAGES``."""
+    pedidas = set()
+    pilha = list(nomes)
+    while pilha:
+        nome = pilha.pop()
+        if nome not in STAGES:
+            raise ValueError(f"Etapa desconhecida: {nome!r}. Disponíveis: {', '.join(STAGES)}")
+        if nome not in pedidas:
+            pedidas.add(nome)
+            pilha.extend(STAGES[nome]['deps'])
+    return [nome for nome in STAGES if nome in pedidas]
+
+
+def stage_keys(grafo, nomes):
+    """Chave de cada etapa: formato e versões das entradas (já encadeadas pelo grafo)."""
+    chaves = {}
+    for nome in nomes:
+        chave = json.dumps({
+            'format': FORMAT_VERSION,
+            'stage': nome,
+            'inputs': STAGES[nome]['inputs'](grafo),
+        }, sort_keys=True)
+        chaves[nome] = hashlib.sha256(chave.encode()).hexdigest()[:16]
+    return chaves
+
+
+def _read_manifest(out_dir):
+    try:
+        with open(Path(out_dir) / "manifest.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _is_fresh(entrada, chave, out_dir):
+    return (
+        entrada is not None
+        and entrada['key'] == chave
+        and all((Path(out_dir) / saida).exists() for saida in entrada['outputs'])
+    )
+
+
+def _run_stage(nome, grafo, out_dir, max_workers):
+    inicio = time.perf_counter()
+    saidas = STAGES[nome]['run'](grafo, out_dir, max_workers)
+    return saidas, time.perf_counter() - inicio
+
+
+def run(stages=None, out_dir=OUT_DIR, max_workers=None, force=False, cache=None):
+    """Executa ``stages`` (todas por padrão) e as suas dependências.
+
+    Retorna {etapa: 'executada' | 'pulada'}. Uma etapa só começa quando as
+    dependências terminaram; as prontas rodam em paralelo.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    nomes = _with_deps(stages or list(STAGES))
+    grafo = analysis_graph(cache)
+    chaves = stage_keys(grafo, nomes)
+    manifesto = _read_manifest(out_dir)
+    resultado = {}
+    pendentes = list(nomes)
+    em_execucao = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(nomes), os.cpu_count() or 1)) as executor:
+        while pendentes or em_execucao:
+            prontas = [nome for nome in pendentes if all(dep in resultado for dep in STAGES[nome]['deps'])]
+            for nome in prontas:
+                pendentes.remove(nome)
+                if not force and _is_fresh(manifesto.get(nome), chaves[nome], out_dir):
+                    resultado[nome] = 'pulada'
+                else:
+                    em_execucao[executor.submit(_run_stage, nome, grafo, out_dir, max_workers)] = nome
+            if not em_execucao:
+                continue
+
+            concluidas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidas:
+                nome = em_execucao.pop(futuro)
+                saidas, segundos = futuro.result()
+                manifesto[nome] = {
+                    'key': chaves[nome],
+                    'outputs': saidas,
+                    'seconds': round(segundos, 3),
+                    'created_at': datetime.now(timezone.utc).isoformat(),
+                }
+                # Gravado a cada etapa: uma falha depois não perde o que já terminou.
+                write_text_atomic(out_dir / "manifest.json", json.dumps(manifesto, indent=2))
+                resultado[nome] = 'executada'
+    return {nome: resultado[nome] for nome in nomes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Executa a análise completa e grava os resultados em um diretório")
+    parser.add_argument('--out', default=str(OUT_DIR), help=f'diretório de saída (padrão: {OUT_DIR})')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=None, help='etapas (e as suas dependências)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='executa mesmo as etapas sem mudanças')
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    resultado = run(args.stages, args.out, max_workers=args.workers, force=args.force)
+    manifesto = _read_manifest(args.out)
+    for nome, estado in resultado.items():
+        print(f"{nome:<13} {estado:<9} {manifesto[nome]['seconds']:>8.2f}s  {', '.join(manifesto[nome]['outputs'])}")
+    print(f"Resultados em {args.out} ({time.perf_counter() - inicio:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
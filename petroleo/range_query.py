@@ -0,0 +1,71 @@
+"""Consultas por intervalo de datas sobre uma série ordenada.
+
+O filtro de datas da página principal vira dois ``searchsorted`` sobre um
+``DatetimeIndex`` monotônico, e o fatiamento por posição devolve uma view
+da série (sem cópia). O máximo e o mínimo de qualquer janela saem de sparse
+tables pré-calculadas em O(1) por consulta.
+"""
+import numpy as np
+
+
+class SparseTable:
+    """Posição do máximo (ou mínimo) de ``values[i:j]`` em O(1).
+
+    O preparo custa O(n log n): o nível ``k`` guarda, para cada ``i``, a
+    posição do melhor valor em ``values[i:i + 2**k]``. Em caso de empate
+    vale a primeira ocorrência, como em ``Series.idxmax``.
+    """
+
+    def __init__(self, values, op='max'):
+        if op not in ('max', 'min'):
+            raise ValueError(f"op deve ser 'max' ou 'min', não '{op}'")
+        self.values = np.asarray(values, dtype=np.float64)
+        self._melhor = np.greater if op == 'max' else np.less
+
+        nivel = np.arange(len(self.values), dtype=np.int32)
+        self.niveis = [nivel]
+        largura = 1
+        while 2 * largura <= len(self.values):
+            esquerda, direita = nivel[:-largura], nivel[largura:]
+            nivel = np.where(self._melhor(self.values[direita], self.values[esquerda]), direita, esquerda)
+            self.niveis.append(nivel)
+            largura *= 2
+
+    def query(self, inicio, fim):
+        """Posição do melhor valor em ``[inicio, fim)``; o intervalo não pode ser vazio."""
+        if not 0 <= inicio < fim <= len(self.values):
+            raise IndexError(f"intervalo inválido [{inicio}, {fim}) para {len(self.values)} valores")
+        k = int(fim - inicio).bit_length() - 1
+        esquerda = self.niveis[k][inicio]
+        direita = self.niveis[k][fim - (1 << k)]
+        return int(direita if self._melhor(self.values[direita], self.values[esquerda]) else esquerda)
+
+
+class SeriesRange:
+    """Série indexada por data com fatiamento e extremos por intervalo."""
+
+    def __init__(self, series):
+        if not series.index.is_monotonic_increasing:
+            series = series.sort_index()
+        self.series = series
+        self.maximo = SparseTable(series.to_numpy(), 'max')
+        self.minimo = SparseTable(series.to_numpy(), 'min')
+
+    def bounds(self, inicio, fim):
+        """Posições ``[i, j)`` das datas entre ``inicio`` e ``fim`` (inclusive)."""
+        index = self.series.index
+        return int(index.searchsorted(inicio, side='left')), int(index.searchsorted(fim, side='right'))
+
+    def window(self, inicio, fim):
+        i, j = self.bounds(inicio, fim)
+        return self.series.iloc[i:j]
+
+    def max(self, inicio, fim):
+        """``(data, valor)`` do máximo entre ``inicio`` e ``fim``."""
+        posicao = self.maximo.query(*self.bounds(inicio, fim))
+        return self.series.index[posicao], self.series.iloc[posicao]
+
+    def min(self, inicio, fim):
+        """``(data, valor)`` do mínimo entre ``inicio`` e ``fim``."""
+        posicao = self.minimo.query(*self.bounds(inicio, fim))
+        return self.series.index[posicao], self.series.iloc[posicao]
@@ -0,0 +1,194 @@
+"""Atualização incremental dos CSVs do IPEA pela rede.
+
+Para cada série de ``SOURCES`` o ``refresh`` pede ao servidor só as cotações
+posteriores à última data já guardada, acrescenta essas linhas ao CSV local
+(no mesmo formato do ipeadata, em ordem decrescente) e chama
+``data.dataset_version``, que detecta as linhas novas e as grava como mais uma
+partição Parquet, sem reprocessar o histórico.
+
+As requisições usam uma única ``requests.Session`` (conexão reaproveitada
+entre as séries), novas tentativas com espera exponencial para falhas de
+conexão e respostas 429/5xx, e cabeçalhos condicionais (``If-None-Match`` /
+``If-Modified-Since``, guardados em ``.cache/refresh/state.json``): se nada
+mudou no servidor a resposta é um 304 sem corpo.
+
+Dois formatos de resposta são aceitos: o CSV exportado pelo ipeadata
+(``DATA;<coluna>`` com vírgula decimal), filtrado pelo parâmetro ``desde``,
+e o JSON da API OData do ipeadata, filtrado com ``$filter``.
+
+    python -m petroleo.refresh
+    python -m petroleo.refresh --base-url http://127.0.0.1:8765   # servidor local (petroleo.ipea_stub)
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from petroleo import CACHE_DIR, data, write_text_atomic
+
+REFRESH_DIR = CACHE_DIR / "refresh"
+IPEA_ODATA_URL = "http://www.ipeadata.gov.br/api/odata4/ValoresSerie(SERCODIGO='{serie}')"
+TIMEOUT = 30
+
+SOURCES = {
+    'petroleo': {'serie': 'EIA366_PBRENT366', 'path': data.PETROLEO_CSV, 'coluna': data.PETROLEO_COLUNA, 'nome': 'Preço'},
+    'dolar': {'serie': 'GM366_ERC366', 'path': data.DOLAR_CSV, 'coluna': data.DOLAR_COLUNA, 'nome': 'Cotacao_Dolar'},
+}
+
+
+def make_session(retries=3, backoff_factor=0.5):
+    """Sessão HTTP com keep-alive e novas tentativas para erros transitórios."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=('GET',),
+        respect_retry_after_header=True,
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=2)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['User-Agent'] = 'petroleo-refresh'
+    return session
+
+
+def source_url(serie, base_url=None):
+    """URL da série: ``<base_url>/<serie>.csv`` ou, sem ``base_url``, a API OData do ipeadata."""
+    if base_url:
+        return f"{base_url.rstrip('/')}/{serie}.csv"
+    return IPEA_ODATA_URL.format(serie=serie)
+
+
+def _read_state(refresh_dir):
+    try:
+        with open(Path(refresh_dir) / "state.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _parse_odata(conteudo, nome):
+    valores = json.loads(conteudo)['value']
+    df = pd.DataFrame({
+        'DATA': pd.to_datetime([v['VALDATA'][:10] for v in valores]),
+        nome: pd.to_numeric([v['VALVALOR'] for v in valores]),
+    })
+    return df.dropna().sort_values('DATA', ignore_index=True)
+
+
+def fetch_new_rows(session, url, desde, coluna, nome, validadores=None):
+    """Linhas do servidor posteriores a ``desde``.
+
+    Retorna ``(df, validadores)``; ``df`` é ``None`` quando o servidor
+    responde 304 (nada mudou desde os ``validadores`` enviados).
+    """
+    desde = pd.Timestamp(desde)
+    headers = {}
+    if validadores:
+        if validadores.get('etag'):
+            headers['If-None-Match'] = validadores['etag']
+        if validadores.get('last_modified'):
+            headers['If-Modified-Since'] = validadores['last_modified']
+    if 'odata' in url:
+        params = {'$filter': f"VALDATA gt {desde:%Y-%m-%d}T23:59:59-03:00"}
+    else:
+        params = {'desde': f"{desde:%Y-%m-%d}"}
+
+    resposta = session.get(url, params=params, headers=headers, timeout=TIMEOUT)
+    if resposta.status_code == 304:
+        return None, validadores
+    resposta.raise_for_status()
+
+    if 'json' in resposta.headers.get('Content-Type', ''):
+        df = _parse_odata(resposta.content, nome)
+    else:
+        df = data.parse_ipea_csv(resposta.content, coluna, nome)
+    novos_validadores = {
+        'etag': resposta.headers.get('ETag'),
+        'last_modified': resposta.headers.get('Last-Modified'),
+    }
+    # O filtro do servidor é só uma otimização: a data é conferida aqui também.
+    return df[df['DATA'] > desde].reset_index(drop=True), novos_validadores
+
+
+def _format_rows(df, nome):
+    """Linhas no formato do ipeadata (``dd/mm/aaaa;valor`` com vírgula decimal)."""
+    return "".join(
+        f"{datum:%d/%m/%Y};{repr(float(valor)).replace('.', ',')}\n"
+        for datum, valor in zip(df['DATA'], df[nome])
+    ).encode('ascii')
+
+
+def append_rows(path, df_novo, nome):
+    """Acrescenta as linhas ao CSV na posição em que o ipeadata as colocaria.
+
+    Em ordem decrescente (a do ipeadata) entram logo após o cabeçalho; em
+    ordem crescente, no final. É exatamente o caso incremental que
+    ``data.dataset_version`` reconhece.
+    """
+    with open(path, "rb") as f:
+        conteudo = f.read()
+    fim_cabecalho = conteudo.index(b"\n") + 1
+    linhas = [linha for linha in conteudo[fim_cabecalho:].split(b"\n", 2)[:2] if linha.strip()]
+    datas = data.parse_ipea_dates([linha.split(b";")[0].strip() for linha in linhas])
+    decrescente = len(datas) < 2 or datas[0] >= datas[1]
+
+    if decrescente:
+        novo = conteudo[:fim_cabecalho] + _format_rows(df_novo.iloc[::-1], nome) + conteudo[fim_cabecalho:]
+    else:
+        separador = b"" if conteudo.endswith(b"\n") else b"\n"
+        novo = conteudo + separador + _format_rows(df_novo, nome)
+
+    tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(novo)
+    os.replace(tmp_path, path)
+
+
+def refresh(sources=None, base_url=None, session=None, refresh_dir=REFRESH_DIR, cache_dir=data.DATA_DIR):
+    """Busca as linhas novas de cada série; retorna {série: linhas acrescentadas}."""
+    sources = sources or list(SOURCES)
+    session = session or make_session()
+    estado = _read_state(refresh_dir)
+    resultado = {}
+    for source in sources:
+        config = SOURCES[source]
+        url = source_url(config['serie'], base_url)
+        ultima_data = data.load_series(config['path'], config['coluna'], config['nome'], cache_dir)['DATA'].max()
+
+        df_novo, validadores = fetch_new_rows(
+            session, url, ultima_data, config['coluna'], config['nome'], estado.get(url)
+        )
+        if validadores:
+            estado[url] = validadores
+        if df_novo is None or df_novo.empty:
+            resultado[source] = 0
+            continue
+
+        append_rows(config['path'], df_novo, config['nome'])
+        data.dataset_version(config['path'], config['coluna'], config['nome'], cache_dir)
+        resultado[source] = len(df_novo)
+
+    write_text_atomic(Path(refresh_dir) / "state.json", json.dumps(estado, indent=2))
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca no ipeadata as cotações novas e atualiza os CSVs e o cache")
+    parser.add_argument('--base-url', default=os.environ.get('PETROLEO_IPEA_URL'), help='servidor com <serie>.csv (p.ex. petroleo.ipea_stub)')
+    parser.add_argument('--series', nargs='+', choices=list(SOURCES), default=None)
+    args = parser.parse_args()
+
+    for source, linhas in refresh(args.series, args.base_url).items():
+        print(f"{source}: {linhas} linhas novas")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Previsão de várias séries definidas em configuração.
+
+Cada série de ``SERIES`` é o produto de uma ou mais séries base do IPEA
+(``BASES``), alinhadas pela data: o Brent em reais é o Brent em dólares vezes
+a cotação do dia (ou do último dia útil anterior, até 3 dias). Para cada série
+são gerados, com os mesmos hiperparâmetros e datas de corte da página de
+modelagem, a previsão do período de teste, as métricas e a previsão futura.
+
+Os ajustes rodam em paralelo (``ProcessPoolExecutor``), um processo por
+série, e cada resultado fica em ``.cache/series/<série>/<versão>/``. A versão
+depende das séries base usadas, dos hiperparâmetros e das configurações, então
+uma série só é reajustada quando os seus próprios dados mudam.
+
+    python -m petroleo.series
+    python -m petroleo.series --series brl_usd brent_brl --workers 2
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from pathlib import Path
+
+import pandas as pd
+
+from petroleo import CACHE_DIR, align, artifacts, data, forecast, model_store, shared, tuning
+from petroleo.metrics import error_metrics
+
+SERIES_DIR = CACHE_DIR / "series"
+FORMAT_VERSION = 2
+
+# Séries base: (CSV, coluna do IPEA, nome da coluna no DataFrame)
+BASES = {
+    'petroleo': (data.PETROLEO_CSV, data.PETROLEO_COLUNA, 'Preço'),
+    'dolar': (data.DOLAR_CSV, data.DOLAR_COLUNA, 'Cotacao_Dolar'),
+}
+
+# ``factors``: séries base multiplicadas para formar a série; a primeira
+# define o calendário.
+SERIES = {
+    'brent_usd': {'label': 'Petróleo Brent (US$/barril)', 'unit': 'US$', 'factors': ['petroleo']},
+    'brl_usd': {'label': 'Dólar comercial (R$/US$)', 'unit': 'R$', 'factors': ['dolar']},
+    'brent_brl': {'label': 'Petróleo Brent (R$/barril)', 'unit': 'R$', 'factors': ['petroleo', 'dolar']},
+}
+
+
+def _base_frame(base):
+    path, coluna, nome = BASES[base]
+    return shared.load_series(path, coluna, nome).rename(columns={nome: base})
+
+
+def load(series_id):
+    """Série ``series_id`` com as colunas ``ds`` e ``y``."""
+    fatores = SERIES[series_id]['factors']
+    df = _base_frame(fatores[0])
+    for base in fatores[1:]:
+        df = align.align(df, _base_frame(base), calendar='left', tolerance='3D', direction='backward', fill='drop')
+    return pd.DataFrame({'ds': df['DATA'], 'y': df[fatores].prod(axis=1)}).reset_index(drop=True)
+
+
+def series_version(series_id, params, settings=artifacts.DEFAULT_SETTINGS):
+    versoes_base = {base: data.dataset_version(*BASES[base]) for base in SERIES[series_id]['factors']}
+    chave = json.dumps({
+        'format': FORMAT_VERSION,
+        'series': SERIES[series_id],
+        'data': versoes_base,
+        'params': params,
+        'settings': settings,
+        'prophet': metadata.version('prophet'),
+    }, sort_keys=True)
+    return hashlib.sha256(chave.encode()).hexdigest()[:16]
+
+
+def _fit_series(series_id, version, params, settings, series_dir):
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    df = load(series_id)
+    df = df[(df['ds'] >= settings['inicio']) & (df['ds'] <= settings['fim'])].reset_index(drop=True)
+    df_train = df[df['ds'] <= settings['split_date']]
+    df_test = df[df['ds'] > settings['split_date']]
+
+    model = model_store.fit_or_load(df_train, params, series=series_id)
+    df_test_fcst = model.predict(df_test[['ds']])
+    metricas = error_metrics(y_true=df_test['y'], y_pred=df_test_fcst['yhat'])
+
+    horizontes = settings['forecast_horizons']
+    df_futuro = forecast.forecast(model_store.fit_or_load(df, params, series=series_id), horizontes)[max(horizontes)]
+
+    destino = Path(series_dir) / series_id / version
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=destino.parent))
+    try:
+        df.to_parquet(tmp_dir / "history.parquet", index=False)
+        df_test_fcst[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].to_parquet(tmp_dir / "forecast.parquet", index=False)
+        df_futuro.drop(columns='scenario').to_parquet(tmp_dir / "future.parquet", index=False)
+        with open(tmp_dir / "metrics.json", "w") as f:
+            json.dump({
+                'series': series_id,
+                'version': version,
+                'params': params,
+                'settings': settings,
+                'metrics': {k: float(v) for k, v in metricas.items()},
+            }, f, indent=2)
+        if destino.exists():
+            shutil.rmtree(destino)
+        os.replace(tmp_dir, destino)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return series_id
+
+
+def build_all(series_ids=None, params=None, settings=artifacts.DEFAULT_SETTINGS, series_dir=SERIES_DIR, max_workers=None, force=False):
+    """Ajusta em paralelo as séries sem resultado em cache; retorna {série: versão}."""
+    series_ids = list(series_ids or SERIES)
+    params = params or tuning.load_best_params()
+    versoes = {series_id: series_version(series_id, params, settings) for series_id in series_ids}
+    pendentes = [
+        series_id for series_id, version in versoes.items()
+        if force or not (Path(series_dir) / series_id / version).exists()
+    ]
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=max_workers or min(len(pendentes), os.cpu_count() or 1)) as executor:
+            list(executor.map(
+                _fit_series,
+                pendentes,
+                [versoes[series_id] for series_id in pendentes],
+                [params] * len(pendentes),
+                [settings] * len(pendentes),
+                [series_dir] * len(pendentes),
+            ))
+    return versoes
+
+
+def load_results(series_id, version, series_dir=SERIES_DIR):
+    """Lê os resultados de ``series_id``; levanta ``FileNotFoundError`` se não existirem."""
+    origem = Path(series_dir) / series_id / version
+    with open(origem / "metrics.json") as f:
+        metricas = json.load(f)
+    return {
+        'metrics': metricas,
+        'history': pd.read_parquet(origem / "history.parquet"),
+        'forecast': pd.read_parquet(origem / "forecast.parquet"),
+        'future': pd.read_parquet(origem / "future.parquet"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajusta e prevê as séries configuradas em paralelo")
+    parser.add_argument('--series', nargs='+', choices=list(SERIES), default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help='reajusta mesmo se a versão já existir')
+    args = parser.parse_args()
+
+    versoes = build_all(args.series, max_workers=args.workers, force=args.force)
+    for series_id, version in versoes.items():
+        metricas = load_results(series_id, version)['metrics']['metrics']
+        print(f"{series_id:<10} {version}  RMSE {metricas['rmse']:.3f}  MAE {metricas['mae']:.3f}  MAPE {metricas['mape']:.2f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Séries publicadas uma vez em disco e abertas sem cópia por vários processos.
+
+``publish_frame`` grava cada coluna de um DataFrame numérico/de datas como um
+``.npy`` em ``.cache/shared/<chave>/``; ``attach_frame`` abre esses arquivos
+com ``np.load(mmap_mode='r')`` e monta um DataFrame sobre os próprios mapas,
+sem copiar. As páginas do sistema operacional são compartilhadas por todos os
+processos que abrem a mesma chave: a memória não cresce com o número de
+servidores do Streamlit ou de workers, e os ajustes em paralelo recebem só o
+caminho (a ``chave``) em vez de uma cópia serializada do DataFrame.
+
+    handle = shared.publish_frame(df)            # no processo principal
+    df = shared.attach_frame(handle)             # em cada worker
+
+Os arrays são somente leitura; com o copy-on-write do pandas, qualquer
+alteração no DataFrame cria uma cópia local em vez de falhar. A chave é o
+hash do conteúdo (ou, em ``load_series``, a versão de ``data.dataset_version``),
+então dados novos vão para outro diretório; só os ``MAX_ENTRIES`` mais
+recentes são mantidos.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from petroleo import CACHE_DIR, data
+
+SHARED_DIR = CACHE_DIR / "shared"
+MAX_ENTRIES = 16
+
+# Frames já abertos neste processo, por diretório.
+_anexados = {}
+
+
+def frame_key(df):
+    """Hash do conteúdo, dos nomes e dos tipos das colunas de ``df``."""
+    h = hashlib.sha256(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()[:24]
+
+
+def publish_frame(df, key=None, shared_dir=SHARED_DIR):
+    """Grava ``df`` (se ainda não existir) e retorna o diretório, que serve de handle."""
+    destino = Path(shared_dir) / (key or frame_key(df))
+    if destino.exists():
+        return str(destino)
+
+    for coluna, tipo in df.dtypes.items():
+        if not (pd.api.types.is_numeric_dtype(tipo) or pd.api.types.is_datetime64_dtype(tipo)):
+            raise ValueError(f"Coluna {coluna!r} ({tipo}) não pode ser compartilhada: só colunas numéricas ou de datas")
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{destino.name}-", dir=destino.parent))
+    try:
+        # Arquivos numerados: os nomes das colunas podem ter acentos.
+        for i, coluna in enumerate(df.columns):
+            np.save(tmp_dir / f"{i}.npy", np.ascontiguousarray(df[coluna].to_numpy()))
+        with open(tmp_dir / "columns.json", "w") as f:
+            json.dump([str(coluna) for coluna in df.columns], f, ensure_ascii=False)
+        os.replace(tmp_dir, destino)
+    except OSError:
+        # Outro processo publicou a mesma chave ao mesmo tempo.
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not destino.exists():
+            raise
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    _trim(destino.parent)
+    return str(destino)
+
+
+def attach_frame(handle):
+    """DataFrame somente leitura sobre os arquivos de ``handle`` (sem cópia)."""
+    df = _anexados.get(handle)
+    if df is None:
+        with open(Path(handle) / "columns.json") as f:
+            colunas = json.load(f)
+        df = pd.DataFrame(
+            {coluna: np.load(Path(handle) / f"{i}.npy", mmap_mode='r') for i, coluna in enumerate(colunas)},
+            copy=False,
+        )
+        if len(_anexados) >= MAX_ENTRIES:
+            _anexados.pop(next(iter(_anexados)))
+        _anexados[handle] = df
+    return df
+
+
+def load_series(path, coluna, nome, shared_dir=SHARED_DIR):
+    """``data.load_series`` publicada e aberta via ``attach_frame``.
+
+    A chave é a versão do conteúdo do CSV: o primeiro processo a pedir uma
+    versão nova lê as partições Parquet e publica; os demais só abrem.
+    """
+    slug = unicodedata.normalize('NFKD', nome).encode('ascii', 'ignore').decode().lower()
+    key = f"{slug}-{data.dataset_version(path, coluna, nome)[:20]}"
+    destino = Path(shared_dir) / key
+    if not destino.exists():
+        publish_frame(data.load_series(path, coluna, nome), key=key, shared_dir=shared_dir)
+    return attach_frame(str(destino))
+
+
+def _trim(shared_dir, max_entries=MAX_ENTRIES):
+    """Remove os diretórios mais antigos além de ``max_entries``.
+
+    Processos que ainda tenham os arquivos abertos continuam lendo: no Linux o
+    mapa segue válido depois da remoção.
+    """
+    entradas = [path for path in Path(shared_dir).iterdir() if path.is_dir() and not path.name.startswith('.')]
+    if len(entradas) <= max_entries:
+        return
+    entradas.sort(key=lambda path: path.stat().st_mtime_ns)
+    for path in entradas[:len(entradas) - max_entries]:
+        shutil.rmtree(path, ignore_errors=True)
+        _anexados.pop(str(path), None)
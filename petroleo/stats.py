@@ -0,0 +1,146 @@
+"""Estatísticas da relação entre o petróleo Brent e o dólar.
+
+``relationship_stats`` reúne Pearson, Spearman e a regressão OLS (com o
+resumo do statsmodels) em um único cálculo, para ser feito uma vez por
+versão dos dados. As variantes móveis mostram como a relação muda ao longo
+do tempo: Pearson e beta custam O(1) por passo com somas móveis por
+blocos; Spearman mantém a janela ordenada e atualiza os postos a cada
+passo, com memória O(w).
+"""
+import bisect
+
+import numpy as np
+
+
+def relationship_stats(x, y):
+    """Correlação de Pearson/Spearman e OLS de ``y`` sobre ``x``."""
+    import statsmodels.api as sm
+    from scipy.stats import pearsonr, spearmanr
+
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    pearson_corr, pearson_p = pearsonr(x, y)
+    spearman_corr, spearman_p = spearmanr(x, y)
+    modelo_ols = sm.OLS(y, sm.add_constant(x)).fit()
+    return {
+        'pearson': float(pearson_corr),
+        'pearson_p': float(pearson_p),
+        'spearman': float(spearman_corr),
+        'spearman_p': float(spearman_p),
+        'intercept': float(modelo_ols.params[0]),
+        'slope': float(modelo_ols.params[1]),
+        'r2': float(modelo_ols.rsquared),
+        'n': len(x),
+        'ols_summary': modelo_ols.summary().as_text(),
+    }
+
+
+def _rolling_sum(valores, window):
+    """Soma de cada janela terminando em ``window - 1, ..., n - 1``.
+
+    Divide a série em blocos de tamanho ``window`` e guarda somas
+    acumuladas para frente e para trás dentro de cada bloco (van Herk /
+    Gil-Werman): toda janela é um sufixo de um bloco mais um prefixo do
+    seguinte, então cada passo custa O(1) sem subtrair somas acumuladas
+    grandes, o que destruiria a precisão nos trechos em que a série tem
+    ordem de grandeza muito menor (o dólar antes do Plano Real, p.ex.).
+    """
+    n = len(valores)
+    blocos = -(-n // window)
+    preenchido = np.zeros(blocos * window)
+    preenchido[:n] = valores
+    preenchido = preenchido.reshape(blocos, window)
+    prefixo = np.cumsum(preenchido, axis=1).ravel()
+    sufixo = np.cumsum(preenchido[:, ::-1], axis=1)[:, ::-1].ravel()
+    inicio = np.arange(n - window + 1)
+    fim = inicio + window - 1
+    return np.where(inicio % window == 0, sufixo[inicio], sufixo[inicio] + prefixo[fim])
+
+
+def _rolling_moments(x, y, window):
+    """Covariância e variâncias (sem normalizar) de cada janela."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    sx, sy, sxx, syy, sxy = (_rolling_sum(serie, window) for serie in (x, y, x * x, y * y, x * y))
+    cov = sxy - sx * sy / window
+    var_x = sxx - sx * sx / window
+    var_y = syy - sy * sy / window
+    return cov, var_x, var_y
+
+
+def _pad(valores, n, window):
+    resultado = np.full(n, np.nan)
+    resultado[window - 1:] = valores
+    return resultado
+
+
+def rolling_pearson(x, y, window):
+    """Correlação de Pearson na janela que termina em cada posição."""
+    n = len(x)
+    if n < window:
+        return np.full(n, np.nan)
+    cov, var_x, var_y = _rolling_moments(x, y, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _pad(cov / np.sqrt(var_x * var_y), n, window)
+
+
+def rolling_beta(x, y, window):
+    """Inclinação da regressão de ``y`` sobre ``x`` na janela que termina em cada posição."""
+    n = len(x)
+    if n < window:
+        return np.full(n, np.nan)
+    cov, var_x, _ = _rolling_moments(x, y, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return _pad(cov / var_x, n, window)
+
+
+def _centered_ranks(janela):
+    """Postos médios de ``janela`` menos o posto médio ``(w + 1) / 2``."""
+    ordenados = np.sort(janela)
+    menores = np.searchsorted(ordenados, janela, side='left')
+    menores_ou_iguais = np.searchsorted(ordenados, janela, side='right')
+    return (menores + menores_ou_iguais + 1) / 2 - (len(janela) + 1) / 2
+
+
+def rolling_spearman(x, y, window):
+    """Correlação de Spearman (postos médios em empates) na janela que termina em cada posição.
+
+    A janela é mantida em uma lista ordenada: o valor que sai e o que entra
+    são localizados com ``bisect`` (O(log w)), o que dá o posto do novo valor.
+    Os postos dos demais só mudam em 1 (ou 0,5 em empates) quando o valor que
+    entra ou sai é menor ou igual a eles, o que é aplicado aos ``w`` postos
+    da janela numa única operação vetorizada. A memória é O(w), sem
+    reordenar cada janela nem materializar uma matriz ``n × w``. Os postos
+    são múltiplos de 0,5, então as atualizações são exatas em ponto flutuante.
+    As séries não devem ter NaN.
+    """
+    n = len(x)
+    if n < window:
+        return np.full(n, np.nan)
+    rho = np.full(n, np.nan)
+    estados = []
+    for serie in (np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)):
+        janela = serie[:window].copy()
+        # Buffer circular: a posição ``t % window`` guarda o valor do instante t.
+        estados.append((serie, janela, _centered_ranks(janela), sorted(janela.tolist())))
+
+    def _correlacao():
+        (_, _, postos_x, _), (_, _, postos_y, _) = estados
+        denominador = np.sqrt(np.dot(postos_x, postos_x) * np.dot(postos_y, postos_y))
+        return np.dot(postos_x, postos_y) / denominador if denominador > 0 else np.nan
+
+    rho[window - 1] = _correlacao()
+    for t in range(window, n):
+        posicao = t % window
+        for serie, janela, postos, ordenados in estados:
+            sai, entra = janela[posicao], serie[t]
+            del ordenados[bisect.bisect_left(ordenados, sai)]
+            menores = bisect.bisect_left(ordenados, entra)
+            iguais = bisect.bisect_right(ordenados, entra, menores) - menores
+            ordenados.insert(menores, entra)
+            # NaN na posição que muda a exclui das comparações abaixo.
+            janela[posicao] = np.nan
+            postos += (janela > entra) * 1.0 - (janela > sai) + 0.5 * ((janela == entra) * 1.0 - (janela == sai))
+            janela[posicao] = entra
+            postos[posicao] = menores + (iguais + 2) / 2 - (window + 1) / 2
+        rho[t] = _correlacao()
+    return rho
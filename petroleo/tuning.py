@@ -0,0 +1,170 @@
+"""Busca de hiperparâmetros do Prophet com poda sucessiva (successive halving).
+
+Cada configuração começa avaliada em poucos cortes do backtesting; só a
+fração ``1/eta`` melhor em MAPE segue para a próxima rodada com mais cortes.
+O erro de cada par (configuração, corte) é memoizado em disco pelo hash da
+configuração, então uma nova execução só ajusta pontos ainda não avaliados.
+A melhor configuração fica em ``.cache/tuning/best.json`` e é lida pela
+página de modelagem.
+
+    python -m petroleo.tuning --eta 3 --workers 4
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from petroleo import CACHE_DIR, backtest, data, shared, write_text_atomic
+from petroleo.metrics import error_metrics
+
+TUNING_DIR = CACHE_DIR / "tuning"
+BEST_PATH = TUNING_DIR / "best.json"
+
+DEFAULT_PARAMS = {'daily_seasonality': True}
+
+PARAM_GRID = {
+    'changepoint_prior_scale': [0.001, 0.01, 0.05, 0.1, 0.5],
+    'seasonality_prior_scale': [0.01, 0.1, 1.0, 10.0],
+    'seasonality_mode': ['additive', 'multiplicative'],
+    'yearly_seasonality': [True, False],
+    'weekly_seasonality': [True, False],
+    'daily_seasonality': [True, False],
+}
+
+
+def expand_grid(grid):
+    nomes = list(grid)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*(grid[nome] for nome in nomes))]
+
+
+def config_key(config):
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _data_key(df):
+    return hashlib.sha256(pd.util.hash_pandas_object(df[['ds', 'y']], index=False).values.tobytes()).hexdigest()[:16]
+
+
+def _fold_key(fold):
+    return '/'.join(ts.strftime('%Y-%m-%d') for ts in fold)
+
+
+class ResultCache:
+    """Erro por (configuração, corte), salvo em um JSON por configuração."""
+
+    def __init__(self, df, tuning_dir=TUNING_DIR):
+        self.dir = tuning_dir / _data_key(df)
+
+    def _path(self, config):
+        return self.dir / f"{config_key(config)}.json"
+
+    def load(self, config):
+        try:
+            with open(self._path(config)) as f:
+                return json.load(f)['folds']
+        except FileNotFoundError:
+            return {}
+
+    def save(self, config, folds):
+        write_text_atomic(self._path(config), json.dumps({'config': config, 'folds': folds}))
+
+
+def _evaluate_fold(df, config, fold):
+    df_cv = backtest._fit_fold(df, config, fold)
+    return error_metrics(df_cv['y'], df_cv['yhat'])
+
+
+def evaluate(df, configs, folds, cache, executor):
+    """Retorna o MAPE médio de cada configuração nos ``folds``, ajustando só o que falta.
+
+    ``df`` pode ser o handle de ``shared.publish_frame``, que é o que chega aos workers.
+    """
+    resultados = [cache.load(config) for config in configs]
+    pendentes = [
+        (i, fold) for i, config in enumerate(configs) for fold in folds
+        if _fold_key(fold) not in resultados[i]
+    ]
+    if pendentes:
+        metricas = executor.map(
+            _evaluate_fold,
+            [df] * len(pendentes),
+            [configs[i] for i, _ in pendentes],
+            [fold for _, fold in pendentes],
+        )
+        for (i, fold), metrica in zip(pendentes, metricas):
+            resultados[i][_fold_key(fold)] = {k: float(v) for k, v in metrica.items()}
+        for i in sorted({i for i, _ in pendentes}):
+            cache.save(configs[i], resultados[i])
+    return [float(np.mean([resultado[_fold_key(fold)]['mape'] for fold in folds])) for resultado in resultados]
+
+
+def _spread(folds, n):
+    """Escolhe ``n`` cortes espalhados pela série, sempre incluindo o mais recente."""
+    indices = np.unique(np.linspace(len(folds) - 1, 0, n).round().astype(int))
+    return [folds[i] for i in indices]
+
+
+def search(df, grid=PARAM_GRID, folds=None, eta=3, min_folds=2, max_workers=None, tuning_dir=TUNING_DIR):
+    """Successive halving sobre ``grid``; retorna um DataFrame com o ranking final."""
+    df = df[['ds', 'y']].reset_index(drop=True)
+    folds = folds or backtest.make_folds(df['ds'])
+    configs = expand_grid(grid)
+    cache = ResultCache(df, tuning_dir)
+    handle = shared.publish_frame(df)
+
+    n_folds = min(min_folds, len(folds))
+    rodadas = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            folds_rodada = _spread(folds, n_folds)
+            mapes = evaluate(handle, configs, folds_rodada, cache, executor)
+            ranking = sorted(zip(mapes, range(len(configs))))
+            rodadas.append((len(folds_rodada), [(configs[i], mape) for mape, i in ranking]))
+            if n_folds >= len(folds) or len(configs) == 1:
+                break
+            configs = [configs[i] for _, i in ranking[:max(1, math.ceil(len(configs) / eta))]]
+            n_folds = min(n_folds * eta, len(folds))
+
+    n_final, ranking_final = rodadas[-1]
+    return pd.DataFrame([{**config, 'mape': mape, 'folds': n_final} for config, mape in ranking_final])
+
+
+def save_best(params, mape, best_path=BEST_PATH):
+    write_text_atomic(best_path, json.dumps({'params': params, 'mape': mape}, indent=2))
+
+
+def load_best_params(default=DEFAULT_PARAMS, best_path=BEST_PATH):
+    try:
+        with open(best_path) as f:
+            return json.load(f)['params']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return dict(default)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros do Prophet")
+    parser.add_argument('--inicio', default='2019-11-25')
+    parser.add_argument('--fim', default='2024-11-25')
+    parser.add_argument('--eta', type=int, default=3)
+    parser.add_argument('--min-folds', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    df = data.load_petroleo().rename(columns={'DATA': 'ds', 'Preço': 'y'})
+    df = df[(df['ds'] >= args.inicio) & (df['ds'] <= args.fim)]
+
+    ranking = search(df, eta=args.eta, min_folds=args.min_folds, max_workers=args.workers)
+    melhor = ranking.iloc[0]
+    params = {nome: melhor[nome].item() if hasattr(melhor[nome], 'item') else melhor[nome] for nome in PARAM_GRID}
+    save_best(params, float(melhor['mape']))
+    print(ranking.head(10).to_string(index=False))
+    print(f"\nMelhor configuração salva em {BEST_PATH}: {params}")
+
+
+if __name__ == '__main__':
+    main()
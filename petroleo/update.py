@@ -0,0 +1,42 @@
+"""Atualização incremental diária: cache de dados + modelo com warm-start.
+
+Quando o IPEA publica novas cotações, o cache Parquet recebe só as linhas
+novas e o Prophet é reajustado na janela mais recente partindo dos
+parâmetros do modelo anterior.
+
+    python -m petroleo.update --anos 5
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from petroleo import data, model_store, tuning
+
+
+def update(anos=5, params=None, path=data.PETROLEO_CSV):
+    inicio = time.perf_counter()
+    data.dataset_version(data.DOLAR_CSV, data.DOLAR_COLUNA, 'Cotacao_Dolar')
+    df = data.load_petroleo(path).rename(columns={'DATA': 'ds', 'Preço': 'y'})
+    tempo_dados = time.perf_counter() - inicio
+
+    df_train = df[df['ds'] > df['ds'].max() - pd.DateOffset(years=anos)]
+    params = params or tuning.load_best_params()
+    inicio = time.perf_counter()
+    model = model_store.fit_or_load(df_train, params)
+    tempo_modelo = time.perf_counter() - inicio
+    return model, df_train, tempo_dados, tempo_modelo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualização incremental dos dados e do modelo")
+    parser.add_argument('--anos', type=int, default=5, help='tamanho da janela de treino em anos')
+    args = parser.parse_args()
+
+    _, df_train, tempo_dados, tempo_modelo = update(anos=args.anos)
+    print(f"Dados até {df_train['ds'].max():%d/%m/%Y} ({len(df_train)} linhas de treino)")
+    print(f"Atualização dos dados: {tempo_dados:.2f}s | ajuste do modelo: {tempo_modelo:.2f}s")
+
+
+if __name__ == '__main__':
+    main()